@@ -1,22 +1,20 @@
-import json
+import os
+import sys
 from collections import Counter
 import matplotlib.pyplot as plt
 import matplotlib
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "generate-doc"))
+from records import load_vocabulary
+
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
 plt.rcParams['axes.unicode_minus'] = False
 
-with open('netem_full_list.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-words = data["5530考研词汇词频排序表"]
+words = load_vocabulary('netem_full_list.json').entries
 
 # 统计每个词频对应的单词数量
-freq_counter = Counter()
-for item in words:
-    freq = item.get("词频")
-    if freq is not None:
-        freq_counter[freq] += 1
+freq_counter = Counter(item.frequency for item in words)
 
 # 只显示词频在1~50的区间，便于观察主流分布
 x = [freq for freq in range(1, 400)]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Pack netem_full_list.json into a compact binary file and read it back lazily.
+
+File layout (all integers little-endian):
+
+    header      magic b"NTMV", version, record count, title offset/length
+    ranks       uint32[count]      序号
+    freqs       uint32[count]      词频
+    str_offsets uint32[3*count+1]  start of 单词/释义/其他拼写 for every record
+    word_order  uint32[count]      record indexes sorted by word bytes
+    pool        UTF-8 bytes        every string back to back
+
+An empty 其他拼写 slice means the variant is null. The reader memory-maps
+the file and only decodes the strings of the records that are accessed.
+"""
+
+import argparse
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional
+
+from helpers import MappedFile
+from records import DEFAULT_TITLE, VocabEntry, load_vocabulary
+
+MAGIC = b"NTMV"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+FIELDS_PER_RECORD = 3
+FIELD_WORD, FIELD_DEFINITION, FIELD_VARIANT = range(FIELDS_PER_RECORD)
+
+
+
+def export_binary(words: List[VocabEntry], output_file: str, title: str = DEFAULT_TITLE) -> int:
+    """Write the word list to ``output_file`` and return its size in bytes."""
+    count = len(words)
+    pool = bytearray()
+    str_offsets = []
+
+    title_bytes = title.encode("utf-8")
+    pool += title_bytes
+
+    for item in words:
+        for value in (item.word, item.definition, item.variant or ""):
+            str_offsets.append(len(pool))
+            pool += value.encode("utf-8")
+    str_offsets.append(len(pool))
+
+    word_bytes = [item.word.encode("utf-8") for item in words]
+    word_order = sorted(range(count), key=word_bytes.__getitem__)
+
+    with open(output_file, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, 0, len(title_bytes)))
+        f.write(struct.pack(f"<{count}I", *(item.rank for item in words)))
+        f.write(struct.pack(f"<{count}I", *(item.frequency for item in words)))
+        f.write(struct.pack(f"<{len(str_offsets)}I", *str_offsets))
+        f.write(struct.pack(f"<{count}I", *word_order))
+        f.write(pool)
+        return f.tell()
+
+
+class VocabRecord:
+    """Lazy view of one record; strings are decoded only when accessed."""
+
+    __slots__ = ("_file", "index")
+
+    def __init__(self, vocab_file: "BinaryVocabulary", index: int):
+        self._file = vocab_file
+        self.index = index
+
+    @property
+    def rank(self) -> int:
+        return self._file._ranks[self.index]
+
+    @property
+    def frequency(self) -> int:
+        return self._file._freqs[self.index]
+
+    @property
+    def word(self) -> str:
+        return self._file._field(self.index, FIELD_WORD)
+
+    @property
+    def definition(self) -> str:
+        return self._file._field(self.index, FIELD_DEFINITION)
+
+    @property
+    def variant(self) -> Optional[str]:
+        return self._file._field(self.index, FIELD_VARIANT) or None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record in the netem_full_list.json shape."""
+        return {
+            "序号": self.rank,
+            "词频": self.frequency,
+            "单词": self.word,
+            "释义": self.definition,
+            "其他拼写": self.variant,
+        }
+
+    def __repr__(self) -> str:
+        return f"VocabRecord({self.rank}, {self.word!r})"
+
+
+class BinaryVocabulary(MappedFile):
+    """Memory-mapped reader for files written by :func:`export_binary`."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+
+        magic, version, _flags, count, _title_off, title_len = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary vocabulary file")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported version {version}")
+
+        self.count = count
+        pos = HEADER.size
+        self._ranks = self._uint32_array(pos, count)
+        pos += 4 * count
+        self._freqs = self._uint32_array(pos, count)
+        pos += 4 * count
+        self._str_offsets = self._uint32_array(pos, FIELDS_PER_RECORD * count + 1)
+        pos += 4 * (FIELDS_PER_RECORD * count + 1)
+        self._word_order = self._uint32_array(pos, count)
+        pos += 4 * count
+        self._pool = self._view[pos:]
+        self.title = bytes(self._pool[:title_len]).decode("utf-8")
+
+    def _field_bytes(self, index: int, field: int) -> memoryview:
+        slot = index * FIELDS_PER_RECORD + field
+        return self._pool[self._str_offsets[slot]:self._str_offsets[slot + 1]]
+
+    def _field(self, index: int, field: int) -> str:
+        return bytes(self._field_bytes(index, field)).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> VocabRecord:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return VocabRecord(self, index)
+
+    def __iter__(self) -> Iterator[VocabRecord]:
+        for index in range(self.count):
+            yield VocabRecord(self, index)
+
+    def find(self, word: str) -> Optional[VocabRecord]:
+        """Binary search the word order table for an exact headword."""
+        target = word.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._field_bytes(self._word_order[mid], FIELD_WORD)) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            index = self._word_order[lo]
+            if self._field_bytes(index, FIELD_WORD) == target:
+                return VocabRecord(self, index)
+        return None
+
+
+def main():
+    """Export the full list to a binary file and verify it round-trips."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", default="../../netem_full_list.json")
+    parser.add_argument("output", nargs="?", default="netem_full_list.bin")
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary(args.input)
+    words = vocabulary.entries
+    size = export_binary(words, args.output, vocabulary.title)
+    print(f"Packed {len(words)} words into {args.output} ({size} bytes, "
+          f"JSON was {os.path.getsize(args.input)} bytes)")
+
+    with BinaryVocabulary(args.output) as vocab:
+        mismatches = sum(1 for record, item in zip(vocab, words) if record.to_dict() != item.to_dict(with_topic=False))
+        if mismatches or len(vocab) != len(words):
+            print(f"❌ Round-trip check failed for {mismatches} records")
+        else:
+            print(f"✅ Round-trip check passed for {len(vocab)} records")
+
+
+if __name__ == "__main__":
+    main()
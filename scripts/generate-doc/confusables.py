@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Find confusable word pairs (易混词) across the whole vocabulary list.
+
+Words are encoded as padded NumPy code arrays and grouped into length bands.
+Only bands whose lengths differ by at most the edit-distance limit can hold a
+confusable pair. Each band pair is cut into row blocks of at most
+BLOCK_CELLS DP cells, every block is one vectorized Levenshtein pass, and the
+blocks are spread over worker processes, so memory per worker stays bounded
+and even the largest band pair uses every core. Pairs within the limit are ranked by edit distance and then by
+QWERTY keyboard distance of the substituted letters (adapt/adopt, affect/effect).
+
+The result is a neighbor table written to JSON that the chapter renderer reads.
+"""
+
+import argparse
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from records import DEFAULT_WORD_LIST, VocabEntry, load_vocabulary
+
+DEFAULT_OUTPUT_FILE = "confusables.json"
+
+MIN_WORD_LENGTH = 4
+MAX_NEIGHBORS = 5
+
+# DP cells ((rows x columns) x (letters + 1)) per block, about 16 MB of int8.
+BLOCK_CELLS = 1 << 24
+
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+
+def max_distance(length: int) -> int:
+    """Edit distance allowed for a word of ``length`` letters."""
+    return 1 if length <= 6 else 2
+
+
+def _keyboard_positions() -> np.ndarray:
+    """(27, 2) array of key coordinates; index 0 is padding."""
+    positions = np.zeros((27, 2), dtype=np.float32)
+    for row, keys in enumerate(KEYBOARD_ROWS):
+        for col, key in enumerate(keys):
+            # Rows are staggered by roughly half a key.
+            positions[ord(key) - 96] = (row, col + row * 0.5)
+    return positions
+
+
+KEY_POSITIONS = _keyboard_positions()
+
+
+def encode(words: List[str]) -> np.ndarray:
+    """Encode lower-case a-z words as a zero-padded uint8 matrix (a=1 ... z=26)."""
+    width = max(len(w) for w in words)
+    codes = np.zeros((len(words), width), dtype=np.uint8)
+    for i, word in enumerate(words):
+        codes[i, :len(word)] = np.frombuffer(word.encode("ascii"), dtype=np.uint8) - 96
+    return codes
+
+
+def levenshtein_block(a: np.ndarray, b: np.ndarray, limit: int = None) -> np.ndarray:
+    """Edit distance between every row of ``a`` (n, la) and every row of ``b`` (m, lb).
+
+    All words in ``a`` have length ``la`` and all words in ``b`` length ``lb``;
+    the DP is evaluated for all n*m pairs at once, one row of the table at a time.
+    Swapping two adjacent letters counts as one edit (quiet/quite). With a
+    ``limit``, pairs whose last two DP rows both exceed it are dropped as the
+    rows advance and reported as ``limit + 1``.
+    """
+    n, la = a.shape
+    m, lb = b.shape
+    pairs = np.arange(n * m)
+    # Letters of both words of every pair, column-major so each step works on contiguous rows.
+    letters_a = np.ascontiguousarray(a.T[:, pairs // m])
+    letters_b = np.ascontiguousarray(b.T[:, pairs % m])
+    prev = np.broadcast_to(np.arange(lb + 1, dtype=np.int8)[:, None], (lb + 1, n * m)).copy()
+    before_prev = None
+    for i in range(1, la + 1):
+        cur = np.empty_like(prev)
+        cur[0] = i
+        a_i = letters_a[i - 1]
+        mismatch = (a_i != letters_b).view(np.int8)
+        # Deletions and substitutions depend only on the previous row.
+        np.minimum(prev[1:] + 1, prev[:-1] + mismatch, out=cur[1:])
+        if before_prev is not None and lb >= 2:
+            swapped = (a_i == letters_b[:-1]) & (letters_a[i - 2] == letters_b[1:])
+            transposed = np.where(swapped, before_prev[:-2] + 1, cur[2:])
+            np.minimum(cur[2:], transposed, out=cur[2:])
+        # Insertions run left to right within the row.
+        for j in range(1, lb + 1):
+            np.minimum(cur[j], cur[j - 1] + 1, out=cur[j])
+        before_prev, prev = prev, cur
+
+        if limit is not None and i < la:
+            # Finishing from cell (i, j) costs at least the remaining length gap,
+            # and a transposition can skip one row, so a pair is out once both
+            # of its last two rows are.
+            gap = (np.arange(lb + 1) - lb + la - i)[:, None]
+            bound = np.minimum((prev + np.abs(gap).astype(np.int8)).min(axis=0),
+                               (before_prev + np.abs(gap + 1).astype(np.int8)).min(axis=0))
+            alive = bound <= limit
+            if not alive.all():
+                pairs, letters_a, letters_b = pairs[alive], letters_a[:, alive], letters_b[:, alive]
+                prev, before_prev = prev[:, alive], before_prev[:, alive]
+
+    if limit is None:
+        return prev[lb].reshape(n, m)
+    distances = np.full(n * m, limit + 1, dtype=np.int8)
+    distances[pairs] = np.minimum(prev[lb], limit + 1)
+    return distances.reshape(n, m)
+
+
+def keyboard_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Sum of key distances between aligned letters of equal-length code rows."""
+    diff = KEY_POSITIONS[a] - KEY_POSITIONS[b]
+    return np.sqrt((diff ** 2).sum(axis=-1)).sum(axis=-1)
+
+
+def _compare_bands(task: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, bool]) -> List[Tuple[int, int, int, float]]:
+    """Worker: return (i, j, edit distance, keyboard distance) for close pairs of two blocks.
+
+    For a block of a band against the same band, ``codes_b`` starts at the
+    block's first row, so the upper triangle holds each unordered pair once.
+    """
+    ids_a, codes_a, ids_b, codes_b, same_band = task
+    la, lb = codes_a.shape[1], codes_b.shape[1]
+    limit = max_distance(min(la, lb))
+    distances = levenshtein_block(codes_a, codes_b, limit)
+
+    # Distance 0 is the same word in another case (march/March), not a confusable.
+    mask = (distances <= limit) & (distances > 0)
+    if same_band:
+        # Each unordered pair once, never a word with itself.
+        mask &= np.triu(np.ones(distances.shape, dtype=bool), k=1)
+    rows, cols = np.nonzero(mask)
+
+    if la == lb:
+        keys = keyboard_distance(codes_a[rows], codes_b[cols])
+    else:
+        keys = np.full(len(rows), math.inf, dtype=np.float32)
+    return [
+        (int(ids_a[r]), int(ids_b[c]), int(distances[r, c]), float(k))
+        for r, c, k in zip(rows, cols, keys)
+    ]
+
+
+def _band_tasks(band_codes: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> Iterator[Tuple]:
+    """Yield one task per row block of every band pair that can hold a confusable pair."""
+    for la in sorted(band_codes):
+        for lb in range(la, la + max_distance(la) + 1):
+            if lb not in band_codes:
+                continue
+            ids_a, codes_a = band_codes[la]
+            ids_b, codes_b = band_codes[lb]
+            same_band = la == lb
+            rows = max(1, BLOCK_CELLS // (len(ids_b) * (lb + 1)))
+            for start in range(0, len(ids_a), rows):
+                stop = start + rows
+                if same_band:
+                    # Pairs with earlier rows were already covered by earlier blocks.
+                    yield ids_a[start:stop], codes_a[start:stop], ids_b[start:], codes_b[start:], True
+                else:
+                    yield ids_a[start:stop], codes_a[start:stop], ids_b, codes_b, False
+
+
+def find_confusables(words: List[VocabEntry], workers: int = None,
+                     max_neighbors: int = MAX_NEIGHBORS) -> Dict[str, List[List[Any]]]:
+    """Return ``{word: [[neighbor, 释义, edit distance, keyboard distance], ...]}``."""
+    candidates = [
+        (i, item.word.lower()) for i, item in enumerate(words)
+        if item.word.isalpha() and item.word.isascii() and len(item.word) >= MIN_WORD_LENGTH
+    ]
+    bands: Dict[int, List[Tuple[int, str]]] = {}
+    for i, word in candidates:
+        bands.setdefault(len(word), []).append((i, word))
+    band_codes = {
+        length: (np.array([i for i, _ in members]), encode([w for _, w in members]))
+        for length, members in bands.items()
+    }
+
+    neighbors: Dict[int, List[Tuple[int, float, int]]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pairs in pool.map(_compare_bands, _band_tasks(band_codes)):
+            for i, j, distance, keys in pairs:
+                neighbors.setdefault(i, []).append((distance, keys, j))
+                neighbors.setdefault(j, []).append((distance, keys, i))
+
+    table = {}
+    for i in sorted(neighbors):
+        ranked = sorted(neighbors[i])[:max_neighbors]
+        table[words[i].word] = [
+            [words[j].word, words[j].definition, distance, None if math.isinf(keys) else round(keys, 2)]
+            for distance, keys, j in ranked
+        ]
+    return table
+
+
+def main():
+    """Compute the confusable-word neighbor table for the full list."""
+    parser = argparse.ArgumentParser(description="Compute confusable word pairs (易混词).")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--neighbors", type=int, default=MAX_NEIGHBORS, help="neighbors kept per word")
+    args = parser.parse_args()
+
+    words = load_vocabulary(args.words).entries
+
+    table = find_confusables(words, args.workers, args.neighbors)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=1)
+
+    pairs = sum(len(v) for v in table.values()) // 2
+    print(f"✅ Found about {pairs} confusable pairs for {len(table)} words")
+    print(f"📋 Neighbor table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
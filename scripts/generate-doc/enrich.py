@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Batch enrichment of the chapter data through an LLM-style HTTP endpoint.
+
+    build   write one request record per chapter section (or word range)
+    run     send the records with an asyncio keep-alive connection pool,
+            a rate limit, retries and a concurrency cap; every finished
+            record is appended to a JSONL checkpoint so an interrupted run
+            resumes where it stopped
+    merge   fold the enriched fields from the checkpoint into chapter_jsons
+            (split_json.py and watch.py re-apply the checkpoint whenever
+            they regenerate chapters, so the fields survive a rebuild)
+    mock    serve a local endpoint that answers like the real one, for testing
+
+The endpoint is called with an OpenAI-style chat completion body and must
+answer with a JSON object ``{"words": [{"序号": ..., <fields>}, ...]}`` in
+the message content (or as the whole response body).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import time
+import urllib.parse
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from helpers import parse_range
+from records import Chapter, VocabEntry, load_chapter, save_chapter
+
+DEFAULT_CHAPTER_DIR = "chapter_jsons"
+DEFAULT_REQUESTS_FILE = "enrichment_requests.jsonl"
+DEFAULT_RESULTS_FILE = "enrichment_results.jsonl"
+DEFAULT_ENDPOINT = "http://127.0.0.1:8765/v1/chat/completions"
+DEFAULT_MODEL = "gpt-4o-mini"
+API_KEY_ENV = "ENRICH_API_KEY"
+
+WORDS_PER_REQUEST = 30
+CONCURRENCY = 8
+REQUESTS_PER_SECOND = 5.0
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 120.0
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# Fields the endpoint may add to a word (the per-word sections of plan.md).
+ENRICHED_FIELDS = ("音标", "词性变化", "重点辨析", "考点聚焦", "例句", "文化链接", "一词多义")
+
+SYSTEM_PROMPT = """你是考研英语词汇讲解专家。用户会给出一组单词（JSON，含序号、单词、释义、其他拼写）。
+请为每个单词返回一个 JSON 对象，格式为 {"words": [{"序号": 序号, ...}, ...]}，每个单词包含：
+- "音标"：美式音标，如 "/ˈneɪʃn/"
+- "词性变化"：[{"form": 派生词, "pos": 词性, "meaning": 释义}]
+- "重点辨析"：与近义词、形近词的区别
+- "考点聚焦"：常见搭配、易考短语和语法注意事项的列表
+- "例句"：至少 2 个 {"english": 英文例句, "chinese": 中文翻译}
+- "文化链接"：相关文化背景
+- "一词多义"：不同语境下的含义列表
+只输出 JSON，不要输出其他内容。"""
+
+
+class EnrichmentError(Exception):
+    """Raised when a request record cannot be completed."""
+
+
+# ---------------------------------------------------------------------------
+# Request records
+
+
+def request_records(chapter_files: List[str], words_per_request: int = WORDS_PER_REQUEST,
+                    model: str = DEFAULT_MODEL, ranks: Optional[Tuple[int, int]] = None,
+                    system_prompt: str = SYSTEM_PROMPT) -> Iterator[Dict[str, Any]]:
+    """Yield one request record per ``words_per_request`` words of each chapter."""
+    for chapter_file in chapter_files:
+        chapter = load_chapter(chapter_file)
+        words = [w for w in chapter.words if ranks is None or ranks[0] <= w.rank <= ranks[1]]
+        for start in range(0, len(words), words_per_request):
+            batch = words[start:start + words_per_request]
+            payload = [
+                {"序号": w.rank, "单词": w.word, "释义": w.definition, "其他拼写": w.variant}
+                for w in batch
+            ]
+            yield {
+                "custom_id": f"chapter_{chapter.info.chapter_number:02d}_{batch[0].rank}-{batch[-1].rank}",
+                "chapter": chapter.info.chapter_number,
+                "ranks": [w.rank for w in batch],
+                "body": {
+                    "model": model,
+                    "response_format": {"type": "json_object"},
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+                    ],
+                },
+            }
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Return the ids already completed in ``path``.
+
+    A line cut short by a crash is dropped from the file so that new results
+    are appended after the last complete record.
+    """
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    good_end = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["custom_id"])
+            except (ValueError, KeyError):
+                break
+            good_end += len(line)
+    if good_end != os.path.getsize(path):
+        with open(path, 'r+b') as f:
+            f.truncate(good_end)
+    return done
+
+
+# ---------------------------------------------------------------------------
+# HTTP client
+
+
+class HTTPProtocolError(Exception):
+    """The server sent something that is not a valid HTTP/1.1 response."""
+
+
+class ConnectionPool:
+    """HTTP/1.1 keep-alive connections to one origin, at most ``size`` open at once."""
+
+    def __init__(self, url: str, size: int = CONCURRENCY, timeout: float = REQUEST_TIMEOUT,
+                 headers: Optional[Dict[str, str]] = None):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout = timeout
+        self.headers = {"Host": parts.netloc, "Content-Type": "application/json", **(headers or {})}
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def post(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """POST ``body`` and return (status, lower-cased headers, body)."""
+        async with self._slots:
+            reused = bool(self._idle)
+            conn = self._idle.pop() if reused else await self._connect()
+            try:
+                status, headers, data, keep_alive = await asyncio.wait_for(self._exchange(conn, body), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn[1].close()
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once on a new one.
+                conn = await self._connect()
+                try:
+                    status, headers, data, keep_alive = await asyncio.wait_for(self._exchange(conn, body), self.timeout)
+                except BaseException:
+                    conn[1].close()
+                    raise
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+            return status, headers, data
+
+    async def _exchange(self, conn, body: bytes) -> Tuple[int, Dict[str, str], bytes, bool]:
+        reader, writer = conn
+        head = [f"POST {self.path} HTTP/1.1"]
+        head += [f"{name}: {value}" for name, value in self.headers.items()]
+        head += [f"Content-Length: {len(body)}", "Connection: keep-alive", "", ""]
+        writer.write("\r\n".join(head).encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+            raise HTTPProtocolError(f"bad status line {status_line[:80]!r}")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n"):
+                break
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close" and parts[0] != "HTTP/1.0"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, headers, data, keep_alive
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class RateLimiter:
+    """Space requests evenly at ``rate`` per second (0 disables the limit)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        delay = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_enrichment(data: bytes, ranks: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Pull the ``words`` list out of a chat completion (or a plain JSON) response.
+
+    With ``ranks``, the response must cover exactly those 序号: a skipped word
+    would never be retried and an unrequested one would overwrite another word.
+    """
+    response = json.loads(data)
+    if "choices" in response:
+        content = response["choices"][0]["message"]["content"]
+        response = json.loads(content) if isinstance(content, str) else content
+    words = response.get("words") if isinstance(response, dict) else None
+    if not isinstance(words, list) or not all(isinstance(w, dict) and "序号" in w for w in words):
+        raise ValueError("response has no 'words' list with 序号 on every item")
+    if ranks is not None:
+        returned = {w["序号"] for w in words}
+        missing = sorted(set(ranks) - returned)
+        unexpected = sorted(returned - set(ranks), key=str)
+        if missing or unexpected:
+            raise ValueError(f"response 序号 do not match the request (missing {missing}, unexpected {unexpected})")
+    return words
+
+
+# ---------------------------------------------------------------------------
+# Runner
+
+
+class BatchRunner:
+    """Send request records with bounded concurrency and checkpoint every result."""
+
+    def __init__(self, endpoint: str, results_file: str, concurrency: int = CONCURRENCY,
+                 rate: float = REQUESTS_PER_SECOND, retries: int = MAX_RETRIES,
+                 timeout: float = REQUEST_TIMEOUT, api_key: Optional[str] = None):
+        self.endpoint = endpoint
+        self.results_file = results_file
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.completed = 0
+        self.retried = 0
+        self.failed: List[Tuple[str, str]] = []
+
+    async def _send(self, pool: ConnectionPool, limiter: RateLimiter, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        body = json.dumps(record["body"], ensure_ascii=False).encode("utf-8")
+        error = "no attempt made"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+            await limiter.wait()
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random() / 2)
+            try:
+                status, headers, data = await pool.post(body)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPProtocolError) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if status == 200:
+                    try:
+                        return parse_enrichment(data, record["ranks"])
+                    except (ValueError, KeyError, IndexError, TypeError) as exc:
+                        error = f"unusable response: {exc}"
+                elif status in RETRY_STATUSES:
+                    error = f"HTTP {status}"
+                    retry_after = headers.get("retry-after", "")
+                    if retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                else:
+                    raise EnrichmentError(f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}")
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+        raise EnrichmentError(f"gave up after {self.retries + 1} attempts ({error})")
+
+    async def run(self, records: List[Dict[str, Any]]):
+        # The pool caps the requests in flight; a record waiting out a retry
+        # backoff holds no connection, so the others keep the pool busy.
+        pool = ConnectionPool(self.endpoint, self.concurrency, self.timeout, self.headers)
+        limiter = RateLimiter(self.rate)
+
+        with open(self.results_file, 'a', encoding='utf-8') as out:
+            async def complete(record: Dict[str, Any]):
+                try:
+                    words = await self._send(pool, limiter, record)
+                except EnrichmentError as exc:
+                    self.failed.append((record["custom_id"], str(exc)))
+                    return
+                out.write(json.dumps({"custom_id": record["custom_id"], "chapter": record["chapter"],
+                                      "ranks": record["ranks"], "words": words}, ensure_ascii=False) + "\n")
+                out.flush()
+                self.completed += 1
+
+            try:
+                await asyncio.gather(*(complete(record) for record in records))
+            finally:
+                pool.close()
+                out.flush()
+                os.fsync(out.fileno())
+        return pool.opened
+
+
+def load_enrichment(results_file: str = DEFAULT_RESULTS_FILE) -> Dict[int, Dict[str, Any]]:
+    """Return ``{序号: enriched fields}`` from a results checkpoint; later results win.
+
+    A missing file gives an empty map, and a last line still being written
+    by a running batch is ignored. Items whose 序号 was not part of their
+    request are dropped.
+    """
+    enriched: Dict[int, Dict[str, Any]] = {}
+    if not os.path.exists(results_file):
+        return enriched
+    with open(results_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            # Checkpoints written before the request ranks were recorded cannot be checked
+            requested = set(result["ranks"]) if "ranks" in result else None
+            for item in result["words"]:
+                if requested is not None and item["序号"] not in requested:
+                    continue
+                fields = {key: item[key] for key in ENRICHED_FIELDS if key in item}
+                if fields:
+                    enriched.setdefault(item["序号"], {}).update(fields)
+    return enriched
+
+
+def apply_enrichment(words: List[VocabEntry], enriched: Dict[int, Dict[str, Any]]) -> int:
+    """Set the enriched fields on ``words`` (as VocabEntry.extra); return the words changed."""
+    updated = 0
+    for entry in words:
+        fields = enriched.get(entry.rank)
+        if fields and any((entry.extra or {}).get(k) != v for k, v in fields.items()):
+            entry.extra = {**(entry.extra or {}), **fields}
+            updated += 1
+    return updated
+
+
+def merge_results(results_file: str, chapter_files: List[str]) -> Tuple[int, int]:
+    """Copy the enriched fields into the chapter files; return (words updated, files written)."""
+    enriched = load_enrichment(results_file)
+    updated = written = 0
+    for chapter_file in chapter_files:
+        chapter: Chapter = load_chapter(chapter_file)
+        changed = apply_enrichment(chapter.words, enriched)
+        if changed:
+            save_chapter(chapter, chapter_file)
+            updated += changed
+            written += 1
+    return updated, written
+
+
+# ---------------------------------------------------------------------------
+# Mock endpoint
+
+
+def mock_enrichment(words: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Deterministic stand-in for a model answer."""
+    return {"words": [
+        {
+            "序号": w["序号"],
+            "音标": f"/{w['单词']}/",
+            "例句": [{"english": f"This sentence uses {w['单词']}.", "chinese": f"这个句子用到了{w['释义']}。"}],
+            "一词多义": [w["释义"]],
+        }
+        for w in words
+    ]}
+
+
+async def serve_mock(host: str, port: int, latency: float = 0.0, fail_rate: float = 0.0,
+                     seed: Optional[int] = None):
+    """Serve chat completion requests with mock_enrichment until cancelled."""
+    rng = random.Random(seed)
+    served = {"ok": 0, "failed": 0}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if latency:
+                    await asyncio.sleep(latency * (0.5 + rng.random()))
+                if rng.random() < fail_rate:
+                    status, payload = "503 Service Unavailable", b'{"error": "overloaded"}'
+                    served["failed"] += 1
+                else:
+                    words = json.loads(json.loads(body)["messages"][-1]["content"])
+                    content = json.dumps(mock_enrichment(words), ensure_ascii=False)
+                    payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]},
+                                         ensure_ascii=False).encode("utf-8")
+                    status = "200 OK"
+                    served["ok"] += 1
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"🧪 Mock endpoint on http://{host}:{port}/v1/chat/completions")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print(f"🧪 Served {served['ok']} responses, {served['failed']} injected failures")
+
+
+# ---------------------------------------------------------------------------
+# Command line
+
+
+def _chapter_files(directory: str, chapters: Optional[Tuple[int, int]] = None) -> List[str]:
+    files = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("chapter_") and name.endswith(".json"):
+            number = int(name[len("chapter_"):-len(".json")])
+            if chapters is None or chapters[0] <= number <= chapters[1]:
+                files.append(os.path.join(directory, name))
+    return files
+
+
+def main():
+    """Build, run, merge or mock enrichment batches."""
+    parser = argparse.ArgumentParser(description="Enrich chapter words through a batch of HTTP requests.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="write request records")
+    build.add_argument("--chapters", type=parse_range, help="chapter range, e.g. 1-5")
+    build.add_argument("--ranks", type=parse_range, help="序号 range, e.g. 1-500")
+    build.add_argument("--batch-size", type=int, default=WORDS_PER_REQUEST, help="words per request")
+    build.add_argument("--model", default=DEFAULT_MODEL)
+    build.add_argument("--prompt", metavar="FILE", help="system prompt file instead of the built-in one")
+
+    run = commands.add_parser("run", help="send request records and checkpoint the results")
+    run.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    run.add_argument("--concurrency", type=int, default=CONCURRENCY, help="requests in flight (and pool size)")
+    run.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="requests per second, 0 for no limit")
+    run.add_argument("--retries", type=int, default=MAX_RETRIES)
+    run.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="seconds per attempt")
+
+    merge = commands.add_parser("merge", help="merge checkpointed results into the chapter files")
+    merge.add_argument("--chapters", type=parse_range, help="chapter range, e.g. 1-5")
+
+    mock = commands.add_parser("mock", help="serve a local mock endpoint")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8765)
+    mock.add_argument("--latency", type=float, default=0.0, help="mean seconds per response")
+    mock.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 503")
+    mock.add_argument("--seed", type=int)
+
+    for sub in (build, run, merge):
+        sub.add_argument("--chapter-dir", default=DEFAULT_CHAPTER_DIR, help="directory written by split_json.py")
+        sub.add_argument("--requests", default=DEFAULT_REQUESTS_FILE, help="request records (JSONL)")
+        sub.add_argument("--results", default=DEFAULT_RESULTS_FILE, help="checkpointed results (JSONL)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        prompt = SYSTEM_PROMPT
+        if args.prompt:
+            with open(args.prompt, 'r', encoding='utf-8') as f:
+                prompt = f.read()
+        count = 0
+        with open(args.requests, 'w', encoding='utf-8') as f:
+            for record in request_records(_chapter_files(args.chapter_dir, args.chapters), args.batch_size,
+                                          args.model, args.ranks, prompt):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        print(f"✅ Wrote {count} request records to {args.requests}")
+
+    elif args.command == "run":
+        done = load_checkpoint(args.results)
+        records = [r for r in read_jsonl(args.requests) if r["custom_id"] not in done]
+        print(f"📋 {len(records)} requests to send, {len(done)} already done")
+        runner = BatchRunner(args.endpoint, args.results, args.concurrency, args.rate, args.retries,
+                             args.timeout, os.environ.get(API_KEY_ENV))
+        start = time.perf_counter()
+        try:
+            connections = asyncio.run(runner.run(records))
+        except KeyboardInterrupt:
+            print(f"\n⏸️ Interrupted after {runner.completed} requests; run again to resume")
+            return
+        elapsed = time.perf_counter() - start
+        print(f"✅ {runner.completed} requests in {elapsed:.1f} s ({runner.completed / max(elapsed, 1e-9):.1f}/s) "
+              f"over {connections} connections, {runner.retried} retries")
+        for custom_id, error in runner.failed:
+            print(f"❌ {custom_id}: {error}")
+        if runner.failed:
+            print(f"⚠️ {len(runner.failed)} requests failed; run again to retry them")
+
+    elif args.command == "merge":
+        updated, written = merge_results(args.results, _chapter_files(args.chapter_dir, args.chapters))
+        print(f"✅ Merged enriched fields into {updated} words across {written} chapter files")
+
+    else:
+        try:
+            asyncio.run(serve_mock(args.host, args.port, args.latency, args.fail_rate, args.seed))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
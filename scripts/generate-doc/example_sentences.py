@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Retrieve real example sentences for headwords from a local corpus of exam papers.
+
+The corpus is a directory of UTF-8 ``.txt`` files (one exam paper or passage
+per file). Indexing splits every paper into sentences and stores an inverted
+index ``lemma -> sentence`` in SQLite. Papers are tokenised in parallel and
+only new or modified papers are re-indexed. Retrieval results are cached in
+the same database, so repeated renders do not search again. The database
+records which headword list and morphology index produced its lemmas; when
+either changes, the stored sentences are re-lemmatized and the cache dropped.
+Renderers open the index read-only: they never rewrite it and only report a
+mismatch, leaving the rebuild to this script.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from records import DEFAULT_WORD_LIST, load_vocabulary
+
+DEFAULT_CORPUS_DIR = "corpus"
+DEFAULT_INDEX_FILE = "example_index.db"
+
+# Sentences outside this length (in tokens) are never picked as examples.
+MIN_SENTENCE_TOKENS = 6
+MAX_SENTENCE_TOKENS = 30
+IDEAL_SENTENCE_TOKENS = 14
+
+# Bump when the fallback suffix rules in lemmatize() change; stored indexes then rebuild their postings.
+LEMMATIZER_VERSION = "2"
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])[\"'”’)]?\s+(?=[\"'“‘(]?[A-Z])")
+TOKEN_RE = re.compile(r"[A-Za-z]+(?:[-'][A-Za-z]+)*")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY,
+    paper_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    token_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    lemma TEXT NOT NULL,
+    sentence_id INTEGER NOT NULL,
+    PRIMARY KEY (lemma, sentence_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS example_cache (
+    word TEXT PRIMARY KEY,
+    examples TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sentences_paper ON sentences (paper_id);
+"""
+
+# Filled per worker process by _init_worker.
+_HEADWORDS: Set[str] = set()
+_MORPHOLOGY = None
+
+
+def load_headwords(word_list_file: str = DEFAULT_WORD_LIST) -> Set[str]:
+    """Return the lower-cased headwords of netem_full_list.json."""
+    return {item.word.lower() for item in load_vocabulary(word_list_file)}
+
+
+def lemmatize(token: str, headwords: Set[str], morphology=None) -> str:
+    """Map a token to a headword by undoing common inflections, else return it unchanged."""
+    token = token.lower()
+    if token in headwords:
+        return token
+    if morphology is not None:
+        return morphology.lemma(token) or token
+    # Try the e-restoring stems first (notes -> note, hoped -> hope, caring -> care)
+    # so a shorter headword that happens to match (not, hop, car) cannot win.
+    candidates = []
+    if token.endswith("ies"):
+        candidates.append(token[:-3] + "y")
+    if token.endswith("es"):
+        candidates.extend([token[:-1], token[:-2]])
+    if token.endswith("s"):
+        candidates.append(token[:-1])
+    if token.endswith("ied"):
+        candidates.append(token[:-3] + "y")
+    if token.endswith("ed"):
+        candidates.extend([token[:-1], token[:-2]])
+        # planned -> plan: drop the doubled consonant only when it really is doubled
+        if len(token) > 4 and token[-3] == token[-4]:
+            candidates.append(token[:-3])
+    if token.endswith("ing"):
+        candidates.extend([token[:-3] + "e", token[:-3]])
+        if len(token) > 5 and token[-4] == token[-5]:
+            candidates.append(token[:-4])
+    for candidate in candidates:
+        if candidate in headwords:
+            return candidate
+    return token
+
+
+def lemmatizer_fingerprint(headwords: Set[str], morphology_file: Optional[str] = None) -> Dict[str, str]:
+    """Hashes of the inputs that decide how tokens are lemmatized."""
+    morphology_hash = ""
+    if morphology_file:
+        with open(morphology_file, 'rb') as f:
+            morphology_hash = hashlib.sha256(f.read()).hexdigest()
+    return {
+        "lemmatizer": LEMMATIZER_VERSION,
+        "headwords": hashlib.sha256("\n".join(sorted(headwords)).encode('utf-8')).hexdigest(),
+        "morphology": morphology_hash,
+    }
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a passage into sentences on terminal punctuation."""
+    text = re.sub(r"\s+", " ", text).strip()
+    return [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+
+def _init_worker(headwords: Set[str], morphology_file: Optional[str] = None):
+    global _HEADWORDS, _MORPHOLOGY
+    _HEADWORDS = headwords
+    if morphology_file:
+        from morphology import MorphologyIndex
+        _MORPHOLOGY = MorphologyIndex(morphology_file)
+
+
+def _tokenize_paper(path: str) -> Tuple[str, List[Tuple[str, int, List[str]]]]:
+    """Worker: return every usable sentence of a paper with its lemma set."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    sentences = []
+    for sentence in split_sentences(text):
+        tokens = TOKEN_RE.findall(sentence)
+        if not MIN_SENTENCE_TOKENS <= len(tokens) <= MAX_SENTENCE_TOKENS:
+            continue
+        lemmas = sorted({lemmatize(token, _HEADWORDS, _MORPHOLOGY) for token in tokens})
+        sentences.append((sentence, len(tokens), lemmas))
+    return path, sentences
+
+
+class ExampleSentenceIndex:
+    """On-disk inverted index of corpus sentences keyed by headword lemma."""
+
+    def __init__(self, index_file: str = DEFAULT_INDEX_FILE, headwords: Optional[Set[str]] = None,
+                 morphology_file: Optional[str] = None, read_only: bool = False):
+        self.index_file = index_file
+        self.headwords = headwords if headwords is not None else set()
+        # Lemmas come from the morphology index when one is given (ran -> run).
+        self.morphology_file = morphology_file
+        self.morphology = None
+        if morphology_file:
+            from morphology import MorphologyIndex
+            self.morphology = MorphologyIndex(morphology_file)
+        self.read_only = read_only
+        self._memory_cache: Dict[str, List[Dict[str, str]]] = {}
+        if read_only:
+            # Searches and cache hits only; picks made here stay in memory.
+            uri = f"file:{urllib.request.pathname2url(os.path.abspath(index_file))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True)
+            self.relemmatized = False
+            self.stale = self._lemmatizer_changed()
+        else:
+            self.conn = sqlite3.connect(index_file)
+            self.conn.executescript(SCHEMA)
+            self.relemmatized = self._sync_lemmatizer()
+            self.stale = False
+
+    def close(self):
+        self.conn.close()
+        if self.morphology is not None:
+            self.morphology.close()
+
+    def __enter__(self) -> "ExampleSentenceIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _lemmatizer_changed(self) -> bool:
+        """True if the headwords or the morphology index differ from the ones the index was built with."""
+        wanted = lemmatizer_fingerprint(self.headwords, self.morphology_file)
+        try:
+            stored = dict(self.conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.OperationalError:
+            # Built before the meta table existed
+            return True
+        return any(stored.get(key) != value for key, value in wanted.items())
+
+    def _sync_lemmatizer(self) -> bool:
+        """Rebuild the postings from the stored sentences if the lemmatizer changed."""
+        if not self._lemmatizer_changed():
+            return False
+        wanted = lemmatizer_fingerprint(self.headwords, self.morphology_file)
+        sentences = self.conn.execute("SELECT id, text FROM sentences").fetchall()
+        with self.conn:
+            self.conn.execute("DELETE FROM postings")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO postings (lemma, sentence_id) VALUES (?, ?)",
+                ((lemma, sentence_id) for sentence_id, text in sentences
+                 for lemma in {lemmatize(token, self.headwords, self.morphology) for token in TOKEN_RE.findall(text)}),
+            )
+            self.conn.execute("DELETE FROM example_cache")
+            self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", wanted.items())
+        return bool(sentences)
+
+    def _changed_papers(self, corpus_dir: str) -> Tuple[List[Tuple[str, float, int]], List[str]]:
+        """Return (new or modified papers, papers that were deleted from the corpus)."""
+        known = {path: (mtime, size) for path, mtime, size in self.conn.execute("SELECT path, mtime, size FROM papers")}
+        changed, seen = [], set()
+        for root, _dirs, files in os.walk(corpus_dir):
+            for name in sorted(files):
+                if not name.endswith(".txt"):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                seen.add(path)
+                if known.get(path) != (stat.st_mtime, stat.st_size):
+                    changed.append((path, stat.st_mtime, stat.st_size))
+        removed = [path for path in known if path not in seen]
+        return changed, removed
+
+    def _drop_paper(self, path: str):
+        row = self.conn.execute("SELECT id FROM papers WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        paper_id = row[0]
+        self.conn.execute(
+            "DELETE FROM postings WHERE sentence_id IN (SELECT id FROM sentences WHERE paper_id = ?)", (paper_id,)
+        )
+        self.conn.execute("DELETE FROM sentences WHERE paper_id = ?", (paper_id,))
+        self.conn.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
+
+    def update(self, corpus_dir: str = DEFAULT_CORPUS_DIR, workers: Optional[int] = None) -> Tuple[int, int]:
+        """Index new and modified papers in parallel; return (papers indexed, papers removed)."""
+        changed, removed = self._changed_papers(corpus_dir)
+        if not changed and not removed:
+            return 0, 0
+
+        stats = {path: (mtime, size) for path, mtime, size in changed}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.headwords, self.morphology_file)) as pool:
+            results = pool.map(_tokenize_paper, [path for path, _, _ in changed], chunksize=4)
+
+            with self.conn:
+                for path in removed:
+                    self._drop_paper(path)
+                for path, sentences in results:
+                    self._drop_paper(path)
+                    mtime, size = stats[path]
+                    paper_id = self.conn.execute(
+                        "INSERT INTO papers (path, mtime, size) VALUES (?, ?, ?)", (path, mtime, size)
+                    ).lastrowid
+                    for text, token_count, lemmas in sentences:
+                        sentence_id = self.conn.execute(
+                            "INSERT INTO sentences (paper_id, text, token_count) VALUES (?, ?, ?)",
+                            (paper_id, text, token_count),
+                        ).lastrowid
+                        self.conn.executemany(
+                            "INSERT OR IGNORE INTO postings (lemma, sentence_id) VALUES (?, ?)",
+                            ((lemma, sentence_id) for lemma in lemmas),
+                        )
+                # Any cached pick may now be outdated.
+                self.conn.execute("DELETE FROM example_cache")
+        self._memory_cache.clear()
+        return len(changed), len(removed)
+
+    @staticmethod
+    def _score(text: str, token_count: int) -> float:
+        """Lower is better: prefer mid-length, cleanly punctuated sentences."""
+        score = abs(token_count - IDEAL_SENTENCE_TOKENS)
+        if not text[0].isupper():
+            score += 5
+        if text[-1] not in ".!?":
+            score += 5
+        if re.search(r"[\d_()\[\]]", text):
+            score += 3
+        return score
+
+    def _search(self, word: str, limit: int) -> List[Dict[str, str]]:
+        tokens = TOKEN_RE.findall(word)
+        if not tokens:
+            return []
+        lemmas = [lemmatize(token, self.headwords, self.morphology) for token in tokens]
+        query = "SELECT s.text, s.token_count, p.path FROM sentences s JOIN papers p ON p.id = s.paper_id WHERE s.id IN ("
+        query += " INTERSECT ".join("SELECT sentence_id FROM postings WHERE lemma = ?" for _ in lemmas) + ")"
+        rows = self.conn.execute(query, lemmas).fetchall()
+
+        if len(tokens) > 1:
+            phrase = re.compile(r"\b" + r"\w*\s+".join(map(re.escape, tokens)) + r"\w*\b", re.IGNORECASE)
+            rows = [row for row in rows if phrase.search(row[0])]
+
+        rows.sort(key=lambda row: (self._score(row[0], row[1]), len(row[0])))
+        picked, seen = [], set()
+        for text, _count, path in rows:
+            if text.lower() in seen:
+                continue
+            seen.add(text.lower())
+            picked.append({"english": text, "source": os.path.splitext(os.path.basename(path))[0]})
+            if len(picked) == limit:
+                break
+        return picked
+
+    def examples_for(self, word: str, limit: int = 2) -> List[Dict[str, str]]:
+        """Return up to ``limit`` example sentences for a headword, using the cache when possible."""
+        key = f"{word.lower()}\t{limit}"
+        if key in self._memory_cache:
+            return self._memory_cache[key]
+        row = self.conn.execute("SELECT examples FROM example_cache WHERE word = ?", (key,)).fetchone()
+        if row is not None:
+            examples = json.loads(row[0])
+        else:
+            examples = self._search(word, limit)
+            if not self.read_only:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO example_cache (word, examples) VALUES (?, ?)",
+                        (key, json.dumps(examples, ensure_ascii=False)),
+                    )
+        self._memory_cache[key] = examples
+        return examples
+
+    def warm_cache(self, words: Iterable[str], limit: int = 2):
+        """Pre-compute examples for many words inside one transaction (in memory only when read-only)."""
+        pending = []
+        for word in words:
+            key = f"{word.lower()}\t{limit}"
+            if key not in self._memory_cache:
+                pending.append((key, word))
+        cached = dict(self.conn.execute("SELECT word, examples FROM example_cache"))
+        with self.conn:
+            for key, word in pending:
+                if key in cached:
+                    self._memory_cache[key] = json.loads(cached[key])
+                    continue
+                examples = self._search(word, limit)
+                self._memory_cache[key] = examples
+                if self.read_only:
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO example_cache (word, examples) VALUES (?, ?)",
+                    (key, json.dumps(examples, ensure_ascii=False)),
+                )
+
+
+def main():
+    """Index the corpus incrementally, then optionally print examples for some words."""
+    parser = argparse.ArgumentParser(description="Build the example-sentence index from a local corpus.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR, help="directory of .txt exam papers")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="SQLite index file")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--workers", type=int, default=None, help="indexing processes (default: CPU count)")
+    parser.add_argument("--morphology", metavar="INDEX", help="lemmatize with an index built by morphology.py")
+    parser.add_argument("--warm", action="store_true", help="pre-compute examples for every headword")
+    parser.add_argument("query", nargs="*", help="words to look up after indexing")
+    args = parser.parse_args()
+
+    headwords = load_headwords(args.words)
+    with ExampleSentenceIndex(args.index, headwords, args.morphology) as index:
+        if index.relemmatized:
+            print("🔁 Lemmatizer, headwords or morphology index changed; rebuilt the postings and cleared the cache")
+        if os.path.isdir(args.corpus):
+            indexed, removed = index.update(args.corpus, args.workers)
+            print(f"✅ Indexed {indexed} new or modified papers, removed {removed}")
+        else:
+            print(f"Corpus directory '{args.corpus}' not found, using the existing index")
+
+        if args.warm:
+            index.warm_cache(sorted(headwords))
+            print(f"📋 Cached examples for {len(headwords)} headwords")
+
+        for word in args.query:
+            print(f"\n{word}:")
+            for example in index.examples_for(word):
+                print(f"  > {example['english']}  ({example['source']})")
+
+
+if __name__ == "__main__":
+    main()
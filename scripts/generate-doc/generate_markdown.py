@@ -4,16 +4,36 @@ Convert chapter JSON files to Markdown learning documents.
 Each Markdown file contains rich educational content for 90 words.
 """
 
+import argparse
 import json
 import os
 import math
 import re
-from typing import List, Dict, Any
+import time
+from typing import Any, Dict, Iterable, Iterator, List
+
+from output_writer import open_writer
+from records import Chapter, ChapterInfo, VocabEntry, load_chapter
+from topic_index import topic_slug
+
+BOOK_TITLE = "考研词汇学习全书"
+# Output buffer for chapter files and the complete book.
+BOOK_BUFFER_SIZE = 1 << 16
+CHAPTERS_PER_FOLDER = 5
 
 class VocabularyMarkdownGenerator:
     """Generate rich Markdown content for vocabulary learning."""
     
-    def __init__(self):
+    def __init__(self, lean: bool = False, example_index=None, morphology=None, confusables=None):
+        # Lean mode emits the shared study boilerplate once per chapter
+        # instead of repeating it under every word and section.
+        self.lean = lean
+        # Optional ExampleSentenceIndex with real sentences from exam papers
+        self.example_index = example_index
+        # Optional MorphologyIndex replacing the suffix guesses for derivatives
+        self.morphology = morphology
+        # Optional neighbor table written by confusables.py
+        self.confusables = confusables or {}
         self.phonetic_data = self._load_phonetic_data()
     
     def _load_phonetic_data(self) -> Dict[str, str]:
@@ -67,11 +87,36 @@ class VocabularyMarkdownGenerator:
         phonetic = f"/{word}/"  # Placeholder
         return phonetic
     
+    @staticmethod
+    def _enriched(word_data: VocabEntry, field: str) -> Any:
+        """Return an enriched field merged in by enrich.py, or None when it is missing or empty."""
+        return (word_data.extra or {}).get(field) or None
+    
+    @staticmethod
+    def _format_derivative(item: Any) -> str:
+        """Format one enriched 词性变化 item ({form, pos, meaning}) like the generated derivatives."""
+        if not isinstance(item, dict):
+            return str(item)
+        text = item.get("form", "")
+        if item.get("pos"):
+            text += f" *{item['pos']}*"
+        if item.get("meaning"):
+            text += f" ({item['meaning']})"
+        return text
+    
     def _get_word_derivatives(self, word: str, pos: str = None) -> List[str]:
         """Get common derivatives of a word."""
         derivatives = []
         word_lower = word.lower()
         
+        if self.morphology is not None:
+            from morphology import KIND_LABELS, KIND_VARIANT
+            return [
+                f"{form} {KIND_LABELS[kind]}"
+                for form, kind in self.morphology.derivatives(word_lower)
+                if kind != KIND_VARIANT
+            ][:3]
+        
         # Common patterns for derivatives
         if word_lower.endswith('e'):
             base = word_lower[:-1]
@@ -100,6 +145,14 @@ class VocabularyMarkdownGenerator:
         """Generate example sentences for a word."""
         word_lower = word.lower()
         
+        if self.example_index is not None:
+            corpus_examples = self.example_index.examples_for(word)
+            if corpus_examples:
+                return [
+                    {"english": example["english"], "chinese": f"（出自：{example['source']}）"}
+                    for example in corpus_examples
+                ]
+        
         # Common sentence patterns based on word type
         sentences = [
             {
@@ -134,19 +187,32 @@ class VocabularyMarkdownGenerator:
         ]
         return meanings
     
-    def _generate_word_content(self, word_data: Dict[str, Any], index: int) -> str:
+    def _generate_word_content(self, word_data: VocabEntry, index: int) -> str:
         """Generate detailed content for a single word."""
-        word = word_data["单词"]
-        definition = word_data["释义"]
-        frequency = word_data["词频"]
-        sequence = word_data["序号"]
-        variant = word_data.get("其他拼写")
-        
-        phonetic = self._get_phonetic(word)
-        derivatives = self._get_word_derivatives(word)
-        examples = self._generate_example_sentences(word, definition)
-        cultural_note = self._generate_cultural_note(word)
-        multiple_meanings = self._generate_multiple_meanings(word, definition)
+        word = word_data.word
+        definition = word_data.definition
+        frequency = word_data.frequency
+        sequence = word_data.rank
+        variant = word_data.variant
+        topic = word_data.topic
+        
+        # Fields merged in by enrich.py take the place of the generated ones
+        phonetic = self._enriched(word_data, "音标") or self._get_phonetic(word)
+        enriched_derivatives = self._enriched(word_data, "词性变化")
+        if enriched_derivatives:
+            derivatives = [self._format_derivative(item) for item in enriched_derivatives]
+        else:
+            derivatives = self._get_word_derivatives(word)
+        examples = [
+            example for example in self._enriched(word_data, "例句") or []
+            if isinstance(example, dict) and example.get("english")
+        ] or self._generate_example_sentences(word, definition)
+        cultural_note = self._enriched(word_data, "文化链接") or self._generate_cultural_note(word)
+        multiple_meanings = self._enriched(word_data, "一词多义") or self._generate_multiple_meanings(word, definition)
+        if isinstance(multiple_meanings, str):
+            multiple_meanings = [multiple_meanings]
+        distinction = self._enriched(word_data, "重点辨析")
+        focus = self._enriched(word_data, "考点聚焦")
         
         # Generate emoji based on index
         emoji_list = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟", 
@@ -163,12 +229,26 @@ class VocabularyMarkdownGenerator:
         if variant:
             content += f"\n**【其他拼写】** {variant}"
         
+        if topic:
+            content += f"\n**【主题】** {topic}"
+        
         if derivatives:
             content += f"\n\n**【词性变化】**\n"
             for i, derivative in enumerate(derivatives[:3], 1):
                 content += f"- {derivative}\n"
         
-        content += f"""
+        if distinction or focus:
+            # Word-specific analysis is shown in lean mode too; only the boilerplate is shared
+            if distinction:
+                content += f"\n**【重点辨析】**\n{distinction}\n"
+            if focus:
+                content += "\n**【考点聚焦】**\n"
+                if isinstance(focus, list):
+                    content += "".join(f"{i}. {point}\n" for i, point in enumerate(focus, 1))
+                else:
+                    content += f"{focus}\n"
+        elif not self.lean:
+            content += f"""
 **【重点辨析】**
 考研中需要重点关注"{word}"的用法和搭配，特别是在阅读理解和完形填空中的应用。
 
@@ -176,13 +256,15 @@ class VocabularyMarkdownGenerator:
 1. 高频搭配：常与其他词组成固定搭配
 2. 语法要点：注意词性和用法
 3. 考试重点：在考研真题中的常见用法
-
+"""
+        
+        content += """
 **【例句精讲】**"""
         
         for i, example in enumerate(examples, 1):
             content += f"""
 > {example['english']}
-> *{example['chinese']}*
+> *{example.get('chinese', '')}*
 """
         
         content += f"""
@@ -198,11 +280,20 @@ class VocabularyMarkdownGenerator:
         
         return content
     
-    def _generate_section_summary(self, section_num: int, words: List[Dict]) -> str:
+    def _generate_section_summary(self, section_num: int, words: List[VocabEntry]) -> str:
         """Generate summary for a section."""
-        word_list = [w["单词"] for w in words]
+        word_list = [w.word for w in words]
         word_str = " • ".join(word_list)
         
+        if self.lean:
+            return f"""## 📋 第{section_num}节 学习总结
+
+**本节重点单词：** {word_str}
+
+---
+
+"""
+        
         return f"""## 📋 第{section_num}节 学习总结
 
 **本节重点单词：** {word_str}
@@ -219,24 +310,105 @@ class VocabularyMarkdownGenerator:
 
 ---
 
+"""
+    
+    def _generate_confusables_section(self, words: List[VocabEntry]) -> str:
+        """Generate the chapter's 易混词辨析 table from the neighbor table."""
+        rows = []
+        for word_data in words:
+            for neighbor, neighbor_definition, _distance, _keys in self.confusables.get(word_data.word, [])[:2]:
+                rows.append(f"| {word_data.word} | {word_data.definition} | {neighbor} | {neighbor_definition} |")
+        if not rows:
+            return ""
+        return """## ⚠️ 易混词辨析
+
+拼写相近、容易看错或写错的单词，注意对比记忆。
+
+| 单词 | 释义 | 易混词 | 易混词释义 |
+|------|------|--------|------------|
+""" + "\n".join(rows) + "\n\n---\n\n"
+    
+    def _generate_shared_guide(self) -> str:
+        """Generate the study guide that lean mode prints once per chapter."""
+        return """## 📌 通用学习指引
+
+以下内容适用于本章每一个单词，不再在单词条目中重复。
+
+**【重点辨析】**
+考研中需要重点关注每个单词的用法和搭配，特别是在阅读理解和完形填空中的应用。
+
+**【考点聚焦】**
+1. 高频搭配：常与其他词组成固定搭配
+2. 语法要点：注意词性和用法
+3. 考试重点：在考研真题中的常见用法
+
+### 🎯 学习要点
+1. **高频词汇**：每节包含的词汇都是考研英语中的基础词汇
+2. **记忆策略**：建议采用词根词缀记忆法，结合例句加深理解
+3. **应用重点**：这些词汇在阅读理解、写作和翻译中都有重要应用
+
+### 📝 学习建议
+- 每天复习每节单词，确保熟练掌握基本含义
+- 重点关注一词多义和固定搭配
+- 结合真题练习，提高实际应用能力
+
+---
+
 """
     
     def generate_chapter_markdown(self, chapter_file: str, output_dir: str) -> str:
         """Generate a complete Markdown file for a chapter."""
         
         # Read chapter JSON
-        with open(chapter_file, 'r', encoding='utf-8') as f:
-            chapter_data = json.load(f)
+        chapter_data = load_chapter(chapter_file)
         
-        chapter_info = chapter_data["chapter_info"]
-        words = chapter_data["words"]
+        # Save to output directory, one block at a time
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, self.chapter_filename(chapter_data))
+        
+        with open(output_file, 'w', encoding='utf-8', buffering=BOOK_BUFFER_SIZE) as f:
+            f.writelines(self.iter_chapter_markdown(chapter_data))
+        
+        return output_file
+    
+    @staticmethod
+    def chapter_filename(chapter_data: Chapter) -> str:
+        """Return the Markdown file name for a chapter; topics are slugged so the
+        name is valid on every platform ('people: appearance' has a colon)."""
+        info = chapter_data.info
+        topic = topic_slug(info.topic) if info.topic else None
+        return f"{VocabularyMarkdownGenerator.chapter_title(info, topic)}.md"
+    
+    @staticmethod
+    def chapter_folder(chapter_num: int, total_chapters: int) -> str:
+        """Return the folder that groups a chapter with its neighbours (5 chapters per folder)."""
+        folder_start = ((chapter_num - 1) // CHAPTERS_PER_FOLDER) * CHAPTERS_PER_FOLDER + 1
+        folder_end = min(folder_start + CHAPTERS_PER_FOLDER - 1, total_chapters)
+        return f"考研词汇_第{folder_start}-{folder_end}章"
+    
+    @staticmethod
+    def chapter_title(chapter_info: ChapterInfo, topic: str = None) -> str:
+        """Return the chapter title, naming the topic (or ``topic`` in its place) for topic-based chapters."""
+        topic = topic or chapter_info.topic
+        band = chapter_info.band
+        prefix = f"考研词汇学习_{topic}{'_' + band if band else ''}" if topic else "考研词汇学习"
+        return f"{prefix}_第{chapter_info.chapter_number}章"
+    
+    def render_chapter_markdown(self, chapter_data: Chapter) -> str:
+        """Render a chapter's Markdown content without writing it anywhere."""
+        return "".join(self.iter_chapter_markdown(chapter_data))
+    
+    def iter_chapter_markdown(self, chapter_data: Chapter) -> Iterator[str]:
+        """Yield a chapter's Markdown block by block (header, table rows, words, summaries)."""
+        chapter_info = chapter_data.info
+        words = chapter_data.words
         
-        chapter_num = chapter_info["chapter_number"]
-        word_count = chapter_info["word_count"]
-        words_range = chapter_info["words_range"]
+        chapter_num = chapter_info.chapter_number
+        word_count = chapter_info.word_count
+        words_range = chapter_info.words_range
         
         # Create markdown content
-        markdown_content = f"""# 📖 考研词汇学习_第{chapter_num}章
+        yield f"""# 📖 {self.chapter_title(chapter_info)}
 
 > **词汇范围：** 第{words_range}个单词 | **总词数：** {word_count}个
 > 
@@ -255,14 +427,17 @@ class VocabularyMarkdownGenerator:
         
         # Add word overview table
         for word_data in words:
-            word = word_data["单词"]
-            definition = word_data["释义"]
-            sequence = word_data["序号"]
-            frequency = word_data["词频"]
-            phonetic = self._get_phonetic(word)
-            markdown_content += f"\n| {sequence} | {word} | `{phonetic}` | {definition} | {frequency} |"
+            word = word_data.word
+            definition = word_data.definition
+            sequence = word_data.rank
+            frequency = word_data.frequency
+            phonetic = self._enriched(word_data, "音标") or self._get_phonetic(word)
+            yield f"\n| {sequence} | {word} | `{phonetic}` | {definition} | {frequency} |"
+        
+        yield "\n\n---\n\n"
         
-        markdown_content += "\n\n---\n\n"
+        if self.lean:
+            yield self._generate_shared_guide()
         
         # Divide words into 3 sections (30 words each)
         section_size = 30
@@ -272,20 +447,20 @@ class VocabularyMarkdownGenerator:
         
         # Generate content for each section
         for section_num, section_words in enumerate(sections, 1):
-            markdown_content += f"## 📚 第{section_num}节 (单词 {section_words[0]['序号']}-{section_words[-1]['序号']})\n\n"
+            yield f"## 📚 第{section_num}节 (单词 {section_words[0].rank}-{section_words[-1].rank})\n\n"
             
             # Add detailed content for each word in section
             for i, word_data in enumerate(section_words):
-                word_content = self._generate_word_content(word_data, i)
-                markdown_content += word_content
+                yield self._generate_word_content(word_data, i)
             
             # Add section summary
-            section_summary = self._generate_section_summary(section_num, section_words)
-            markdown_content += section_summary
+            yield self._generate_section_summary(section_num, section_words)
+        
+        yield self._generate_confusables_section(words)
         
         # Add chapter conclusion
-        high_freq_words = [w["单词"] for w in words if w["词频"] > 1000]
-        markdown_content += f"""## 🎓 章节总结
+        high_freq_words = [w.word for w in words if w.frequency > 1000]
+        yield f"""## 🎓 章节总结
 
 ### ✨ 本章亮点
 1. **高频核心词**：本章包含{len(high_freq_words)}个高频词汇
@@ -298,7 +473,7 @@ class VocabularyMarkdownGenerator:
 ### 📈 学习进度
 - ✅ 已学习单词：{word_count}个
 - 🎯 当前进度：第{words_range}个单词
-- 📊 完成度：{chapter_num}/{chapter_info['total_chapters']}章
+- 📊 完成度：{chapter_num}/{chapter_info.total_chapters}章
 
 ---
 
@@ -325,69 +500,46 @@ class VocabularyMarkdownGenerator:
 
 > **下一步：** 继续学习第{chapter_num + 1}章，保持学习的连续性和系统性。
 """
-        
-        # Save to output directory
-        os.makedirs(output_dir, exist_ok=True)
-        output_file = os.path.join(output_dir, f"考研词汇学习_第{chapter_num}章.md")
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        
-        return output_file
-
-def main():
-    """Main function to generate all Markdown files."""
-    generator = VocabularyMarkdownGenerator()
-    
-    # Create main output directory
-    base_output_dir = "vocabulary_markdown"
-    os.makedirs(base_output_dir, exist_ok=True)
-    
-    chapter_json_dir = "chapter_jsons"
-    
-    # Get all chapter JSON files
-    chapter_files = []
-    for filename in os.listdir(chapter_json_dir):
-        if filename.startswith("chapter_") and filename.endswith(".json"):
-            chapter_files.append(os.path.join(chapter_json_dir, filename))
-    
-    chapter_files.sort()
-    
-    print(f"Found {len(chapter_files)} chapter files to convert")
     
-    # Process chapters and organize into folders (5 chapters per folder)
-    chapters_per_folder = 5
-    created_files = []
+    @staticmethod
+    def book_anchor(position: int) -> str:
+        """Anchor id of the ``position``-th chapter (1-based) in the complete book."""
+        return f"chapter-{position:03d}"
     
-    for i, chapter_file in enumerate(chapter_files):
-        chapter_num = i + 1
-        folder_start = ((chapter_num - 1) // chapters_per_folder) * chapters_per_folder + 1
-        folder_end = min(folder_start + chapters_per_folder - 1, len(chapter_files))
-        
-        # Create folder for every 5 chapters
-        folder_name = f"考研词汇_第{folder_start}-{folder_end}章"
-        folder_path = os.path.join(base_output_dir, folder_name)
-        
-        # Generate Markdown file
-        output_file = generator.generate_chapter_markdown(chapter_file, folder_path)
-        created_files.append(output_file)
-        
-        print(f"Created: {output_file}")
-    
-    print(f"\n✅ Successfully created {len(created_files)} Markdown files!")
-    print(f"📁 Files are organized in the '{base_output_dir}' directory")
-    
-    # Create summary report
-    import time
+    def write_book(self, chapter_files: Iterable[str], output_file: str, title: str = BOOK_TITLE) -> int:
+        """Stream all chapters into one Markdown book and return the number of words written.
+        
+        The book is written in two passes over the chapter files. The first
+        pass emits the table of contents from each chapter's info, and the
+        second renders the chapters block by block into the buffered file.
+        Only one chapter is held in memory at a time.
+        """
+        chapter_files = list(chapter_files)
+        total_words = 0
+        with open(output_file, 'w', encoding='utf-8', buffering=BOOK_BUFFER_SIZE) as f:
+            f.write(f"# 📚 {title}\n\n## 📑 目录\n\n")
+            for position, chapter_file in enumerate(chapter_files, 1):
+                info = load_chapter(chapter_file).info
+                total_words += info.word_count
+                f.write(f"{position}. [{self.chapter_title(info)}](#{self.book_anchor(position)})"
+                        f" · 第{info.words_range}个单词（{info.word_count}词）\n")
+            f.write(f"\n> **章节数：** {len(chapter_files)}章 | **总词数：** {total_words}个\n\n---\n\n")
+            
+            for position, chapter_file in enumerate(chapter_files, 1):
+                f.write(f'<a id="{self.book_anchor(position)}"></a>\n\n')
+                f.writelines(self.iter_chapter_markdown(load_chapter(chapter_file)))
+                f.write("\n")
+        return total_words
+
+def summary_report(file_count: int) -> str:
+    """The 生成报告.md summary written next to the chapters."""
     current_time = time.strftime('%Y-%m-%d %H:%M:%S')
-    summary_file = os.path.join(base_output_dir, "生成报告.md")
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write(f"""# 📊 考研词汇Markdown文档生成报告
+    return f"""# 📊 考研词汇Markdown文档生成报告
 
 ## 🎯 生成概况
-- **总文件数：** {len(created_files)}个
+- **总文件数：** {file_count}个
 - **总词汇数：** 5530个
-- **文件组织：** 每{chapters_per_folder}个文件一个文件夹
+- **文件组织：** 每{CHAPTERS_PER_FOLDER}个文件一个文件夹
 - **生成时间：** {current_time}
 
 ## 📁 文件结构
@@ -418,7 +570,107 @@ vocabulary_markdown/
 4. 定期复习，巩固记忆
 
 *🌟 祝您考研英语取得优异成绩！*
-""")
+"""
+
+def main():
+    """Main function to generate all Markdown files."""
+    parser = argparse.ArgumentParser(description="Convert chapter JSON files to Markdown learning documents.")
+    parser.add_argument("--lean", action="store_true",
+                        help="emit the shared study boilerplate once per chapter instead of per word")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="write the whole tree into a .zip or .tar.gz archive instead of loose files")
+    parser.add_argument("--examples", metavar="INDEX",
+                        help="take example sentences from an index built by example_sentences.py")
+    parser.add_argument("--morphology", metavar="INDEX",
+                        help="list derivatives from an index built by morphology.py")
+    parser.add_argument("--confusables", metavar="TABLE",
+                        help="add an 易混词辨析 section from a table built by confusables.py")
+    parser.add_argument("--book", metavar="FILE",
+                        help="stream every chapter into one complete Markdown book instead of per-chapter files")
+    args = parser.parse_args()
+    
+    confusables = None
+    if args.confusables:
+        with open(args.confusables, 'r', encoding='utf-8') as f:
+            confusables = json.load(f)
+    
+    morphology = None
+    if args.morphology:
+        from morphology import MorphologyIndex
+        morphology = MorphologyIndex(args.morphology)
+    
+    example_index = None
+    if args.examples:
+        from example_sentences import ExampleSentenceIndex, load_headwords
+        # Read-only: a render never rewrites the index, it only reports a lemmatizer mismatch
+        example_index = ExampleSentenceIndex(args.examples, load_headwords(), args.morphology, read_only=True)
+        if example_index.stale:
+            print(f"⚠️ '{args.examples}' was built with other headwords or another morphology index; "
+                  f"run example_sentences.py{' --morphology ' + args.morphology if args.morphology else ''} "
+                  f"--index {args.examples} to rebuild it")
+    
+    generator = VocabularyMarkdownGenerator(lean=args.lean, example_index=example_index,
+                                            morphology=morphology, confusables=confusables)
+    
+    chapter_json_dir = "chapter_jsons"
+    
+    # Get all chapter JSON files
+    chapter_files = []
+    for filename in os.listdir(chapter_json_dir):
+        if filename.startswith("chapter_") and filename.endswith(".json"):
+            chapter_files.append(os.path.join(chapter_json_dir, filename))
+    
+    chapter_files.sort()
+    
+    print(f"Found {len(chapter_files)} chapter files to convert")
+    
+    if example_index is not None:
+        # Look up every word's examples in one pass before the render loop
+        example_index.warm_cache(entry.word for chapter_file in chapter_files
+                                 for entry in load_chapter(chapter_file).words)
+    
+    if args.book:
+        total_words = generator.write_book(chapter_files, args.book)
+        if example_index is not None:
+            example_index.close()
+        if morphology is not None:
+            morphology.close()
+        print(f"📘 Wrote {total_words} words from {len(chapter_files)} chapters to '{args.book}'")
+        return
+    
+    # Create main output directory (or archive); a failed run leaves no truncated archive
+    base_output_dir = "vocabulary_markdown"
+    try:
+        with open_writer(base_output_dir, args.archive) as writer:
+            # Process chapters and organize into folders (5 chapters per folder)
+            created_files = []
+            
+            for i, chapter_file in enumerate(chapter_files):
+                chapter_num = i + 1
+                
+                # Create folder for every 5 chapters
+                folder_name = generator.chapter_folder(chapter_num, len(chapter_files))
+                
+                # Generate Markdown file, streamed block by block
+                chapter_data = load_chapter(chapter_file)
+                output_file = writer.write_blocks(
+                    os.path.join(folder_name, generator.chapter_filename(chapter_data)),
+                    generator.iter_chapter_markdown(chapter_data),
+                )
+                created_files.append(output_file)
+                
+                print(f"Created: {output_file}")
+            
+            print(f"\n✅ Successfully created {len(created_files)} Markdown files!")
+            print(f"📁 Files are organized in the '{args.archive or base_output_dir}' {'archive' if args.archive else 'directory'}")
+            
+            # Create summary report
+            summary_file = writer.write_text("生成报告.md", summary_report(len(created_files)))
+    finally:
+        if example_index is not None:
+            example_index.close()
+        if morphology is not None:
+            morphology.close()
     
     print(f"📋 生成了总结报告：{summary_file}")
 
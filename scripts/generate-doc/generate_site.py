@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Build a static HTML site from the chapter JSON files.
+
+Pages are rendered through VocabularyMarkdownGenerator, so the site has the
+same chapter and section structure as the Markdown documents. The search
+index is split into one JSON shard per word prefix; the browser only fetches
+the shard for what is being typed. Builds are incremental: a manifest keeps
+the input hash of every page and unchanged pages are not rewritten.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from generate_markdown import VocabularyMarkdownGenerator
+from records import Chapter, ChapterInfo, load_chapter
+
+# Bump when the page layout changes so every page is rebuilt once.
+SITE_BUILD_VERSION = 1
+SHARD_PREFIX_LENGTH = 1
+MANIFEST_NAME = ".build_manifest.json"
+
+WORD_HEADING_RE = re.compile(r"^\S+ (.+?) `[^`]*`$")
+
+STYLE_CSS = """body { max-width: 52rem; margin: 0 auto; padding: 1rem; font-family: -apple-system, "PingFang SC", "Microsoft YaHei", sans-serif; line-height: 1.6; color: #222; }
+nav { display: flex; gap: 1rem; flex-wrap: wrap; align-items: center; border-bottom: 1px solid #ddd; padding-bottom: .5rem; }
+table { border-collapse: collapse; width: 100%; overflow-x: auto; display: block; }
+th, td { border: 1px solid #ddd; padding: .25rem .5rem; text-align: left; }
+blockquote { margin: .5rem 0; padding-left: 1rem; border-left: 4px solid #4A90E2; color: #555; }
+code { background: #f4f4f4; padding: 0 .25rem; }
+#search-results { list-style: none; padding: 0; }
+#search-results li { padding: .25rem 0; }
+"""
+
+SEARCH_JS = """(function () {
+  var PREFIX_LENGTH = %d;
+  var root = document.currentScript.getAttribute("data-root");
+  var shards = {};
+  var input = document.getElementById("search");
+  var results = document.getElementById("search-results");
+
+  function shardKey(query) {
+    var key = query.slice(0, PREFIX_LENGTH).toLowerCase();
+    return /^[a-z]+$/.test(key) ? key : "_";
+  }
+
+  function loadShard(key) {
+    if (!shards[key]) {
+      shards[key] = fetch(root + "search/" + key + ".json")
+        .then(function (r) { return r.ok ? r.json() : []; })
+        .catch(function () { return []; });
+    }
+    return shards[key];
+  }
+
+  function render(query, entries) {
+    results.innerHTML = "";
+    entries.filter(function (e) { return e[0].toLowerCase().indexOf(query) === 0; })
+      .slice(0, 20)
+      .forEach(function (e) {
+        var li = document.createElement("li");
+        var a = document.createElement("a");
+        a.href = root + e[3];
+        a.textContent = e[0] + " — " + e[1];
+        li.appendChild(a);
+        results.appendChild(li);
+      });
+  }
+
+  input.addEventListener("input", function () {
+    var query = input.value.trim().toLowerCase();
+    if (!query) { results.innerHTML = ""; return; }
+    loadShard(shardKey(query)).then(function (entries) {
+      if (input.value.trim().toLowerCase() === query) render(query, entries);
+    });
+  });
+})();
+""" % SHARD_PREFIX_LENGTH
+
+
+def _inline(text: str) -> str:
+    """Convert inline Markdown (code, bold, italics) to HTML."""
+    parts = re.split(r"(`[^`]*`)", text)
+    out = []
+    for part in parts:
+        if part.startswith("`") and part.endswith("`") and len(part) > 1:
+            out.append(f"<code>{html.escape(part[1:-1])}</code>")
+            continue
+        part = html.escape(part, quote=False)
+        part = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", part)
+        part = re.sub(r"\*(.+?)\*", r"<em>\1</em>", part)
+        out.append(part)
+    return "".join(out)
+
+
+def markdown_to_html(markdown: str, heading_id: Callable[[int, str], Optional[str]] = None) -> str:
+    """Convert the Markdown subset emitted by VocabularyMarkdownGenerator to HTML."""
+    out = []
+    lines = markdown.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        stripped = line.strip()
+
+        if not stripped:
+            i += 1
+        elif stripped == "---":
+            out.append("<hr>")
+            i += 1
+        elif stripped.startswith("#"):
+            level = len(stripped) - len(stripped.lstrip("#"))
+            text = stripped[level:].strip()
+            anchor = heading_id(level, text) if heading_id else None
+            id_attr = f' id="{html.escape(anchor)}"' if anchor else ""
+            out.append(f"<h{level}{id_attr}>{_inline(text)}</h{level}>")
+            i += 1
+        elif stripped.startswith("|"):
+            rows = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = [c.strip() for c in lines[i].strip().strip("|").split("|")]
+                if not all(set(c) <= set("-: ") for c in cells):
+                    rows.append(cells)
+                i += 1
+            out.append("<table>")
+            for row_num, cells in enumerate(rows):
+                tag = "th" if row_num == 0 else "td"
+                out.append("<tr>" + "".join(f"<{tag}>{_inline(c)}</{tag}>" for c in cells) + "</tr>")
+            out.append("</table>")
+        elif stripped.startswith(">"):
+            quoted = []
+            while i < len(lines) and lines[i].strip().startswith(">"):
+                quoted.append(_inline(lines[i].strip()[1:].strip()))
+                i += 1
+            out.append("<blockquote>" + "<br>".join(q for q in quoted if q) + "</blockquote>")
+        elif re.match(r"^(- |\d+\. )", stripped):
+            ordered = not stripped.startswith("- ")
+            items = []
+            while i < len(lines) and re.match(r"^(- |\d+\. )", lines[i].strip()):
+                items.append(re.sub(r"^(- |\d+\. )", "", lines[i].strip()))
+                i += 1
+            tag = "ol" if ordered else "ul"
+            out.append(f"<{tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{tag}>")
+        elif stripped.startswith("```"):
+            i += 1
+            block = []
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                block.append(lines[i])
+                i += 1
+            i += 1
+            out.append(f"<pre>{html.escape(chr(10).join(block))}</pre>")
+        else:
+            paragraph = []
+            while i < len(lines) and lines[i].strip() and not re.match(r"^(#|\||>|- |\d+\. |---|```)", lines[i].strip()):
+                paragraph.append(_inline(lines[i].strip()))
+                i += 1
+            out.append("<p>" + "<br>".join(paragraph) + "</p>")
+    return "\n".join(out)
+
+
+def word_anchor(word: str) -> str:
+    """Return the HTML id used for a word entry."""
+    return "w-" + re.sub(r"[^a-z0-9]+", "-", word.lower()).strip("-")
+
+
+def _word_heading_id(level: int, text: str) -> Optional[str]:
+    if level != 3:
+        return None
+    match = WORD_HEADING_RE.match(text)
+    return word_anchor(match.group(1)) if match else None
+
+
+def shard_key(word: str) -> str:
+    """Return the search shard a word belongs to (non-letter prefixes share '_')."""
+    key = word[:SHARD_PREFIX_LENGTH].lower()
+    return key if key.isascii() and key.isalpha() and len(key) == SHARD_PREFIX_LENGTH else "_"
+
+
+class StaticSiteBuilder:
+    """Render chapter pages and the search index, skipping unchanged outputs."""
+
+    def __init__(self, output_dir: str, lean: bool = False):
+        self.output_dir = output_dir
+        self.generator = VocabularyMarkdownGenerator(lean=lean)
+        self.lean = lean
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self.new_manifest: Dict[str, str] = {}
+        self.written: List[str] = []
+        self.skipped: List[str] = []
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != SITE_BUILD_VERSION or manifest.get("lean") != self.lean:
+            return {}
+        return manifest.get("pages", {})
+
+    @staticmethod
+    def _hash(payload: Any) -> str:
+        data = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        return hashlib.sha1(data).hexdigest()
+
+    def _emit(self, relative_path: str, payload: Any, render: Callable[[], str]):
+        """Write ``relative_path`` only when its input hash changed or the file is missing."""
+        digest = self._hash(payload)
+        self.new_manifest[relative_path] = digest
+        path = os.path.join(self.output_dir, relative_path)
+        if self.manifest.get(relative_path) == digest and os.path.exists(path):
+            self.skipped.append(relative_path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render())
+        self.written.append(relative_path)
+
+    @staticmethod
+    def chapter_page(chapter_number: int) -> str:
+        return f"chapter_{chapter_number:02d}.html"
+
+    def _page(self, title: str, body: str, root: str = "") -> str:
+        return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<link rel="stylesheet" href="{root}assets/style.css">
+</head>
+<body>
+<nav>
+<a href="{root}index.html">📚 目录</a>
+<input id="search" type="search" placeholder="搜索单词…" autocomplete="off">
+</nav>
+<ul id="search-results"></ul>
+<main>
+{body}
+</main>
+<script src="{root}assets/search.js" data-root="{root}"></script>
+</body>
+</html>
+"""
+
+    def _render_chapter(self, chapter_data: Chapter) -> str:
+        info = chapter_data.info
+        number = info.chapter_number
+        markdown = self.generator.render_chapter_markdown(chapter_data)
+        body = markdown_to_html(markdown, _word_heading_id)
+
+        links = []
+        if number > 1:
+            links.append(f'<a href="{self.chapter_page(number - 1)}">⬅️ 第{number - 1}章</a>')
+        if number < info.total_chapters:
+            links.append(f'<a href="{self.chapter_page(number + 1)}">第{number + 1}章 ➡️</a>')
+        pager = f'<nav>{" ".join(links)}</nav>' if links else ""
+        return self._page(self.generator.chapter_title(info), body + "\n" + pager)
+
+    def _render_index(self, chapters: List[ChapterInfo]) -> str:
+        items = []
+        for info in chapters:
+            items.append(
+                f'<li><a href="{self.chapter_page(info.chapter_number)}">'
+                f'第{info.chapter_number}章</a> · 第{info.words_range}个单词（{info.word_count}词）</li>'
+            )
+        body = "<h1>📖 考研词汇学习</h1>\n<ol>\n" + "\n".join(items) + "\n</ol>"
+        return self._page("考研词汇学习", body)
+
+    def build(self, chapter_files: List[str]):
+        """Build every page, asset and search shard for the given chapter files."""
+        chapter_infos = []
+        shards: Dict[str, List[List[Any]]] = {}
+
+        for chapter_file in chapter_files:
+            chapter_data = load_chapter(chapter_file)
+            info = chapter_data.info
+            chapter_infos.append(info)
+            page = self.chapter_page(info.chapter_number)
+
+            self._emit(page, [SITE_BUILD_VERSION, chapter_data.to_dict()],
+                       lambda data=chapter_data: self._render_chapter(data))
+
+            for word_data in chapter_data.words:
+                entry = [word_data.word, word_data.definition, word_data.rank,
+                         f'{page}#{word_anchor(word_data.word)}']
+                shards.setdefault(shard_key(word_data.word), []).append(entry)
+                variant = word_data.variant
+                if variant:
+                    for spelling in variant.split(","):
+                        spelling = spelling.strip()
+                        if spelling:
+                            shards.setdefault(shard_key(spelling), []).append([spelling] + entry[1:])
+
+        self._emit("index.html", [SITE_BUILD_VERSION, [info.to_dict() for info in chapter_infos]],
+                   lambda: self._render_index(chapter_infos))
+        self._emit("assets/style.css", STYLE_CSS, lambda: STYLE_CSS)
+        self._emit("assets/search.js", SEARCH_JS, lambda: SEARCH_JS)
+
+        for key, entries in sorted(shards.items()):
+            entries.sort(key=lambda e: e[0].lower())
+            self._emit(f"search/{key}.json", entries,
+                       lambda e=entries: json.dumps(e, ensure_ascii=False, separators=(",", ":")))
+
+        self._remove_stale_outputs()
+        self._save_manifest()
+
+    def _remove_stale_outputs(self):
+        for relative_path in self.manifest:
+            if relative_path not in self.new_manifest:
+                path = os.path.join(self.output_dir, relative_path)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _save_manifest(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": SITE_BUILD_VERSION, "lean": self.lean, "pages": self.new_manifest},
+                      f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """Build (or incrementally rebuild) the static site from chapter_jsons."""
+    parser = argparse.ArgumentParser(description="Build a static HTML site from chapter JSON files.")
+    parser.add_argument("--chapters", default="chapter_jsons", help="directory written by split_json.py")
+    parser.add_argument("--output", default="vocabulary_site")
+    parser.add_argument("--lean", action="store_true", help="use the lean Markdown render mode")
+    args = parser.parse_args()
+
+    chapter_files = sorted(
+        os.path.join(args.chapters, name)
+        for name in os.listdir(args.chapters)
+        if name.startswith("chapter_") and name.endswith(".json")
+    )
+
+    builder = StaticSiteBuilder(args.output, lean=args.lean)
+    builder.build(chapter_files)
+
+    print(f"✅ Wrote {len(builder.written)} files, {len(builder.skipped)} unchanged")
+    print(f"📁 Site is in the '{args.output}' directory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the generate-doc scripts: a memory-mapped reader base for
+the binary index files and the ``first-last`` range argument type.
+"""
+
+import mmap
+import struct
+import sys
+from typing import Tuple
+
+
+class MappedFile:
+    """Memory-map ``path`` read-only and hand out uint32 tables from it.
+
+    Every memoryview stored on the instance is released by :meth:`close`
+    before the map itself, which refuses to close while views are exported.
+    """
+
+    def __init__(self, path: str):
+        self._fh = open(path, "rb")
+        self._mmap = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+    def _uint32_array(self, start: int, length: int):
+        """Zero-copy uint32 view on little-endian hosts, decoded tuple otherwise."""
+        chunk = self._view[start:start + 4 * length]
+        if sys.byteorder == "little":
+            return chunk.cast("I")
+        return struct.unpack(f"<{length}I", chunk)
+
+    def close(self):
+        """Release every view before closing the map and file."""
+        for value in vars(self).values():
+            if isinstance(value, memoryview) and value is not self._view:
+                value.release()
+        self._view.release()
+        self._mmap.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    """Parse ``"3-7"`` (or a single ``"3"``) into an inclusive ``(first, last)`` pair."""
+    first, _, last = value.partition("-")
+    return int(first), int(last or first)
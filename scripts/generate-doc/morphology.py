@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+Build and query a compact morphology index over the headwords.
+
+Every headword, its 其他拼写 variants, its inflections (regular rules plus an
+irregular table) and the headwords derived from it are stored as sorted
+``form -> headword`` entries in one binary file. A reverse table lists the
+entries of every headword, so both "ran -> run" and "run -> runs/ran/running"
+are binary searches over a memory-mapped file that any number of processes
+can share read-only.
+
+File layout (all integers little-endian):
+
+    header          magic b"NTMM", version, headword count, entry count
+    headword_offs   uint32[headwords+1]  headwords sorted by lower-cased bytes
+    form_offs       uint32[entries+1]    entry forms sorted by bytes
+    entry_headword  uint32[entries]      headword index of each entry
+    reverse_offs    uint32[headwords+1]  slice of reverse_entries per headword
+    reverse_entries uint32[entries]      entry indexes grouped by headword
+    entry_kind      uint8[entries]       see KIND_LABELS
+    pool            UTF-8 bytes
+"""
+
+import argparse
+import re
+import struct
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from helpers import MappedFile
+from records import DEFAULT_WORD_LIST, VocabEntry, load_vocabulary
+
+MAGIC = b"NTMM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+DEFAULT_INDEX_FILE = "morphology.bin"
+
+(KIND_HEADWORD, KIND_VARIANT, KIND_PLURAL, KIND_THIRD_PERSON, KIND_PAST,
+ KIND_PAST_PARTICIPLE, KIND_PRESENT_PARTICIPLE, KIND_COMPARATIVE,
+ KIND_SUPERLATIVE, KIND_DERIVED, KIND_PRESENT) = range(11)
+
+# Markdown label used by the renderer for each kind of form.
+KIND_LABELS = {
+    KIND_HEADWORD: "(原形)",
+    KIND_VARIANT: "(其他拼写)",
+    KIND_PLURAL: "*n.* (复数)",
+    KIND_THIRD_PERSON: "*v.* (第三人称单数)",
+    KIND_PAST: "*v.* (过去式)",
+    KIND_PAST_PARTICIPLE: "*v.* (过去分词)",
+    KIND_PRESENT_PARTICIPLE: "*v.* (现在分词)",
+    KIND_COMPARATIVE: "*adj.* (比较级)",
+    KIND_SUPERLATIVE: "*adj.* (最高级)",
+    KIND_DERIVED: "(派生词)",
+    KIND_PRESENT: "*v.* (一般现在时)",
+}
+
+# Forms that are attested rather than produced by suffix rules.
+ATTESTED_KINDS = {KIND_VARIANT, KIND_DERIVED}
+
+# Irregular verbs: base -> (past, past participle, extra forms). Extra forms
+# are third person singular, except -ing forms and PRESENT_FORMS.
+IRREGULAR_VERBS = {
+    "be": ("was were", "been", "am is are being"),
+    "have": ("had", "had", "has having"),
+    "do": ("did", "done", "does doing"),
+    "go": ("went", "gone", "goes going"),
+    "arise": ("arose", "arisen", ""), "awake": ("awoke", "awoken", ""),
+    "bear": ("bore", "born borne", ""), "beat": ("beat", "beaten", ""),
+    "become": ("became", "become", ""), "begin": ("began", "begun", ""),
+    "bend": ("bent", "bent", ""), "bet": ("bet", "bet", ""),
+    "bind": ("bound", "bound", ""), "bite": ("bit", "bitten", ""),
+    "bleed": ("bled", "bled", ""), "blow": ("blew", "blown", ""),
+    "break": ("broke", "broken", ""), "breed": ("bred", "bred", ""),
+    "bring": ("brought", "brought", ""), "broadcast": ("broadcast", "broadcast", ""),
+    "build": ("built", "built", ""), "burn": ("burnt burned", "burnt burned", ""),
+    "burst": ("burst", "burst", ""), "buy": ("bought", "bought", ""),
+    "cast": ("cast", "cast", ""), "catch": ("caught", "caught", ""),
+    "choose": ("chose", "chosen", ""), "cling": ("clung", "clung", ""),
+    "come": ("came", "come", ""), "cost": ("cost", "cost", ""),
+    "creep": ("crept", "crept", ""), "cut": ("cut", "cut", ""),
+    "deal": ("dealt", "dealt", ""), "dig": ("dug", "dug", ""),
+    "draw": ("drew", "drawn", ""), "dream": ("dreamt dreamed", "dreamt dreamed", ""),
+    "drink": ("drank", "drunk", ""), "drive": ("drove", "driven", ""),
+    "eat": ("ate", "eaten", ""), "fall": ("fell", "fallen", ""),
+    "feed": ("fed", "fed", ""), "feel": ("felt", "felt", ""),
+    "fight": ("fought", "fought", ""), "find": ("found", "found", ""),
+    "flee": ("fled", "fled", ""), "fly": ("flew", "flown", "flies"),
+    "forbid": ("forbade", "forbidden", ""), "forecast": ("forecast", "forecast", ""),
+    "forget": ("forgot", "forgotten", ""), "forgive": ("forgave", "forgiven", ""),
+    "freeze": ("froze", "frozen", ""), "get": ("got", "got gotten", ""),
+    "give": ("gave", "given", ""), "grind": ("ground", "ground", ""),
+    "grow": ("grew", "grown", ""), "hang": ("hung hanged", "hung hanged", ""),
+    "hear": ("heard", "heard", ""), "hide": ("hid", "hidden", ""),
+    "hit": ("hit", "hit", ""), "hold": ("held", "held", ""),
+    "hurt": ("hurt", "hurt", ""), "keep": ("kept", "kept", ""),
+    "kneel": ("knelt", "knelt", ""), "know": ("knew", "known", ""),
+    "lay": ("laid", "laid", ""), "lead": ("led", "led", ""),
+    "lean": ("leant leaned", "leant leaned", ""), "leap": ("leapt leaped", "leapt leaped", ""),
+    "learn": ("learnt learned", "learnt learned", ""), "leave": ("left", "left", ""),
+    "lend": ("lent", "lent", ""), "let": ("let", "let", ""),
+    "lie": ("lay lied", "lain lied", "lying"), "light": ("lit lighted", "lit lighted", ""),
+    "lose": ("lost", "lost", ""), "make": ("made", "made", ""),
+    "mean": ("meant", "meant", ""), "meet": ("met", "met", ""),
+    "mistake": ("mistook", "mistaken", ""), "overcome": ("overcame", "overcome", ""),
+    "pay": ("paid", "paid", ""), "prove": ("proved", "proved proven", ""),
+    "put": ("put", "put", ""), "quit": ("quit", "quit", ""),
+    "read": ("read", "read", ""), "ride": ("rode", "ridden", ""),
+    "ring": ("rang", "rung", ""), "rise": ("rose", "risen", ""),
+    "run": ("ran", "run", ""), "say": ("said", "said", ""),
+    "see": ("saw", "seen", ""), "seek": ("sought", "sought", ""),
+    "sell": ("sold", "sold", ""), "send": ("sent", "sent", ""),
+    "set": ("set", "set", ""), "shake": ("shook", "shaken", ""),
+    "shine": ("shone", "shone", ""), "shoot": ("shot", "shot", ""),
+    "show": ("showed", "shown", ""), "shrink": ("shrank", "shrunk", ""),
+    "shut": ("shut", "shut", ""), "sing": ("sang", "sung", ""),
+    "sink": ("sank", "sunk", ""), "sit": ("sat", "sat", ""),
+    "sleep": ("slept", "slept", ""), "slide": ("slid", "slid", ""),
+    "smell": ("smelt smelled", "smelt smelled", ""), "speak": ("spoke", "spoken", ""),
+    "speed": ("sped", "sped", ""), "spell": ("spelt spelled", "spelt spelled", ""),
+    "spend": ("spent", "spent", ""), "spill": ("spilt spilled", "spilt spilled", ""),
+    "spin": ("spun", "spun", ""), "spit": ("spat", "spat", ""),
+    "split": ("split", "split", ""), "spoil": ("spoilt spoiled", "spoilt spoiled", ""),
+    "spread": ("spread", "spread", ""), "spring": ("sprang", "sprung", ""),
+    "stand": ("stood", "stood", ""), "steal": ("stole", "stolen", ""),
+    "stick": ("stuck", "stuck", ""), "sting": ("stung", "stung", ""),
+    "strike": ("struck", "struck", ""), "strive": ("strove", "striven", ""),
+    "swear": ("swore", "sworn", ""), "sweep": ("swept", "swept", ""),
+    "swell": ("swelled", "swollen", ""), "swim": ("swam", "swum", ""),
+    "swing": ("swung", "swung", ""), "take": ("took", "taken", ""),
+    "teach": ("taught", "taught", ""), "tear": ("tore", "torn", ""),
+    "tell": ("told", "told", ""), "think": ("thought", "thought", ""),
+    "throw": ("threw", "thrown", ""), "understand": ("understood", "understood", ""),
+    "undertake": ("undertook", "undertaken", ""), "upset": ("upset", "upset", ""),
+    "wake": ("woke", "woken", ""), "wear": ("wore", "worn", ""),
+    "weave": ("wove", "woven", ""), "weep": ("wept", "wept", ""),
+    "win": ("won", "won", ""), "wind": ("wound", "wound", ""),
+    "withdraw": ("withdrew", "withdrawn", ""), "write": ("wrote", "written", ""),
+}
+
+IRREGULAR_PLURALS = {
+    "man": "men", "woman": "women", "child": "children", "foot": "feet",
+    "tooth": "teeth", "goose": "geese", "mouse": "mice", "person": "people",
+    "ox": "oxen", "analysis": "analyses", "basis": "bases", "crisis": "crises",
+    "hypothesis": "hypotheses", "thesis": "theses", "diagnosis": "diagnoses",
+    "phenomenon": "phenomena", "criterion": "criteria", "medium": "media",
+    "datum": "data", "bacterium": "bacteria", "curriculum": "curricula",
+    "life": "lives", "knife": "knives", "wife": "wives", "leaf": "leaves",
+    "half": "halves", "shelf": "shelves", "wolf": "wolves", "thief": "thieves",
+    "self": "selves", "loaf": "loaves", "calf": "calves",
+    "sheep": "sheep", "deer": "deer", "fish": "fish", "species": "species",
+    "series": "series", "means": "means", "aircraft": "aircraft",
+}
+
+IRREGULAR_COMPARISONS = {
+    "good": ("better", "best"), "well": ("better", "best"),
+    "bad": ("worse", "worst"), "ill": ("worse", "worst"),
+    "far": ("farther further", "farthest furthest"),
+    "little": ("less", "least"), "many": ("more", "most"), "much": ("more", "most"),
+}
+
+# Present tense forms other than the third person singular.
+PRESENT_FORMS = {"am", "are"}
+
+# Closed-class words; they keep table-driven forms but get no suffix rules.
+FUNCTION_WORDS = set("""
+    a an the this that these those some any each every either neither no none
+    i me my mine you your yours he him his she her hers it its we us our ours
+    they them their theirs who whom whose which what whatever whoever whichever
+    myself yourself himself herself itself ourselves themselves
+    someone somebody something anyone anybody anything everyone everybody
+    everything nobody nothing
+    of to in on at by for with from into onto upon about above across after
+    against along among around before behind below beneath beside besides
+    between beyond despite during except inside outside over through throughout
+    toward towards under underneath until till unto via within without per
+    and or nor but yet so because although though unless whereas whether while
+    if than as since once
+    be have do shall should will would may might must ought could can
+    not very too also just only even still already always never ever often
+    sometimes perhaps rather quite almost thus hence therefore however moreover
+    furthermore nevertheless nonetheless otherwise indeed else here there then
+    now when where why how yes
+""".split())
+
+# Adjective-only words whose gloss may lack 的 (tall: 高); they take -er/-est
+# but no noun or verb forms. Words that are also verbs (clean, dry) are left
+# to their gloss.
+GRADABLE = set("""
+    big small large tall short high low old young new great strong weak rich
+    poor cheap deep wide broad hard soft early late easy heavy thick thin fat
+    hot cold sad glad kind nice wise sure true quick loud proud bright dark
+    full sharp simple safe
+""".split())
+
+# Glosses ending in 的 that are not adjectives.
+NON_ADJECTIVE_GLOSSES = {"目的", "的"}
+
+# Two-syllable words stressed on the last syllable double it (prefer -> preferred).
+STRESSED_FINAL = set("""
+    admit commit permit submit omit emit remit transmit acquit outwit
+    prefer refer confer defer infer transfer deter occur incur recur
+    regret forget begin upset control patrol compel expel propel repel dispel
+    excel rebel equip forbid allot abet
+""".split())
+
+# Suffixes tried when looking for headwords derived from another headword.
+DERIVATION_SUFFIXES = (
+    "ly", "ness", "ment", "ion", "tion", "ation", "ition", "er", "or", "ist",
+    "ism", "ity", "ive", "ful", "less", "able", "ible", "al", "ial", "ous",
+    "ance", "ence", "ant", "ent", "ship", "hood", "ize", "ise", "en", "ic", "y",
+)
+
+# Shorter bases produce mostly accidental matches (be -> bible).
+MIN_DERIVATION_BASE = 4
+
+VOWELS = set("aeiou")
+
+
+def syllables(word: str) -> int:
+    """Rough syllable count: vowel groups, less a silent final e."""
+    count, previous = 0, False
+    for i, letter in enumerate(word):
+        vowel = letter in VOWELS or (letter == "y" and i > 0)
+        if vowel and not previous:
+            count += 1
+        previous = vowel
+    if count > 1 and word.endswith("e") and not word.endswith(("le", "ee")):
+        count -= 1
+    return max(count, 1)
+
+
+def _doubles_final(word: str) -> bool:
+    """Stressed consonant-vowel-consonant endings double their last letter
+    (stop -> stopped, prefer -> preferred, but color -> colored)."""
+    return (
+        len(word) >= 3
+        and word[-1] not in VOWELS and word[-1] not in "wxy"
+        and word[-2] in VOWELS and word[-3] not in VOWELS
+        and (syllables(word) == 1 or word in STRESSED_FINAL)
+    )
+
+
+def takes_comparison(word: str) -> bool:
+    """Short adjectives compare with -er/-est; longer ones use more/most."""
+    return syllables(word) == 1 or (syllables(word) == 2 and word.endswith(("y", "le", "ow", "er")))
+
+
+def gloss_classes(definition: str) -> Tuple[bool, bool]:
+    """Return (has an adjective sense, has only adjective senses) from a 释义."""
+    senses = [sense.strip() for sense in re.split(r"[、，,；;]", definition) if sense.strip()]
+    adjective = [sense.endswith("的") and sense not in NON_ADJECTIVE_GLOSSES for sense in senses]
+    return any(adjective), bool(adjective) and all(adjective)
+
+
+def regular_inflections(word: str, adjective: bool = False, inflects: bool = True) -> List[Tuple[str, int]]:
+    """Return rule-based inflections of a lower-case single word.
+
+    ``inflects`` adds the noun/verb forms (-s, -ed, -ing) and ``adjective``
+    the -er/-est forms, which only short adjectives take.
+    """
+    forms = []
+    if inflects:
+        forms += _noun_verb_inflections(word)
+    if adjective and takes_comparison(word):
+        forms += _comparisons(word)
+    return forms
+
+
+def _noun_verb_inflections(word: str) -> List[Tuple[str, int]]:
+    forms = []
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        s_form = word + "es"
+    elif word.endswith("y") and len(word) > 1 and word[-2] not in VOWELS:
+        s_form = word[:-1] + "ies"
+    else:
+        s_form = word + "s"
+    forms.append((s_form, KIND_PLURAL))
+    forms.append((s_form, KIND_THIRD_PERSON))
+
+    if word.endswith("e"):
+        ed_form = word + "d"
+    elif word.endswith("y") and len(word) > 1 and word[-2] not in VOWELS:
+        ed_form = word[:-1] + "ied"
+    elif _doubles_final(word):
+        ed_form = word + word[-1] + "ed"
+    else:
+        ed_form = word + "ed"
+    forms.append((ed_form, KIND_PAST))
+    forms.append((ed_form, KIND_PAST_PARTICIPLE))
+
+    if word.endswith("ie"):
+        ing_form = word[:-2] + "ying"
+    elif word.endswith("e") and not word.endswith(("ee", "ye", "oe")) and len(word) > 2:
+        ing_form = word[:-1] + "ing"
+    elif _doubles_final(word):
+        ing_form = word + word[-1] + "ing"
+    else:
+        ing_form = word + "ing"
+    forms.append((ing_form, KIND_PRESENT_PARTICIPLE))
+    return forms
+
+
+def _comparisons(word: str) -> List[Tuple[str, int]]:
+    if word.endswith("e"):
+        stem = word[:-1]
+    elif word.endswith("y") and len(word) > 1 and word[-2] not in VOWELS:
+        stem = word[:-1] + "i"
+    elif _doubles_final(word):
+        stem = word + word[-1]
+    else:
+        stem = word
+    return [(stem + "er", KIND_COMPARATIVE), (stem + "est", KIND_SUPERLATIVE)]
+
+
+def irregular_inflections(word: str) -> List[Tuple[str, int]]:
+    """Return table-driven inflections of a lower-case word."""
+    forms = []
+    if word in IRREGULAR_VERBS:
+        past, participle, extra = IRREGULAR_VERBS[word]
+        forms += [(form, KIND_PAST) for form in past.split()]
+        forms += [(form, KIND_PAST_PARTICIPLE) for form in participle.split()]
+        for form in extra.split():
+            if form.endswith("ing"):
+                kind = KIND_PRESENT_PARTICIPLE
+            elif form in PRESENT_FORMS:
+                kind = KIND_PRESENT
+            else:
+                kind = KIND_THIRD_PERSON
+            forms.append((form, kind))
+    if word in IRREGULAR_PLURALS:
+        forms.append((IRREGULAR_PLURALS[word], KIND_PLURAL))
+    if word in IRREGULAR_COMPARISONS:
+        comparative, superlative = IRREGULAR_COMPARISONS[word]
+        forms += [(form, KIND_COMPARATIVE) for form in comparative.split()]
+        forms += [(form, KIND_SUPERLATIVE) for form in superlative.split()]
+    return forms
+
+
+def derivation_stems(word: str) -> Set[str]:
+    """Spellings a suffix may attach to (happy -> happi, create -> creat)."""
+    stems = {word}
+    if word.endswith("e"):
+        stems.add(word[:-1])
+    if word.endswith("y"):
+        stems.add(word[:-1] + "i")
+    if word.endswith("le"):
+        stems.add(word[:-2])
+    if _doubles_final(word):
+        stems.add(word + word[-1])
+    return stems
+
+
+def build_entries(words: List[VocabEntry]) -> Tuple[List[str], List[Tuple[str, int, int]]]:
+    """Return (sorted headwords, sorted (form, headword index, kind) entries)."""
+    headwords = sorted({item.word.lower() for item in words}, key=lambda w: w.encode("utf-8"))
+    position = {word: i for i, word in enumerate(headwords)}
+    headword_set = set(headwords)
+    entries: Set[Tuple[str, int, int]] = set()
+
+    # Plural and comparative headwords (data, better) are already inflected,
+    # and good/bad/far only take their table forms.
+    non_inflecting = FUNCTION_WORDS | set(IRREGULAR_COMPARISONS) | {
+        plural for singular, plural in IRREGULAR_PLURALS.items() if plural != singular
+    } | {form for pair in IRREGULAR_COMPARISONS.values() for forms in pair for form in forms.split()}
+
+    # headword -> (has an adjective sense, has only adjective senses)
+    classes: Dict[str, Tuple[bool, bool]] = {}
+    variants: Dict[str, List[str]] = {}
+    for item in words:
+        word = item.word.lower()
+        adjective, only_adjective = gloss_classes(item.definition)
+        if word in classes:
+            seen_adjective, seen_only = classes[word]
+            adjective, only_adjective = adjective or seen_adjective, only_adjective and seen_only
+        classes[word] = (adjective, only_adjective)
+        variant = item.variant
+        if variant:
+            variants.setdefault(item.word.lower(), []).extend(
+                v.strip().lower() for v in variant.split(",") if v.strip()
+            )
+
+    for word in headwords:
+        index = position[word]
+        entries.add((word, index, KIND_HEADWORD))
+        spellings = [word] + variants.get(word, [])
+        for spelling in spellings[1:]:
+            entries.add((spelling, index, KIND_VARIANT))
+
+        adjective, only_adjective = classes[word]
+        adjective = adjective or word in GRADABLE
+        inflects = not (only_adjective or word in GRADABLE)
+        for spelling in spellings:
+            if not spelling.isalpha():
+                continue
+            for form, kind in irregular_inflections(spelling):
+                entries.add((form, index, kind))
+            if word in non_inflecting:
+                continue
+            irregular_kinds = {kind for _, kind in irregular_inflections(spelling)}
+            for form, kind in regular_inflections(spelling, adjective, inflects):
+                # A rule-built form that is itself a headword is almost always
+                # a different word (bed is not the past of be).
+                if form not in headword_set and kind not in irregular_kinds:
+                    entries.add((form, index, kind))
+
+        if word.isalpha() and len(word) >= MIN_DERIVATION_BASE:
+            for stem in derivation_stems(word):
+                if len(stem) < MIN_DERIVATION_BASE:
+                    continue
+                for suffix in DERIVATION_SUFFIXES:
+                    derived = stem + suffix
+                    if derived != word and derived in headword_set:
+                        entries.add((derived, index, KIND_DERIVED))
+
+    ordered = sorted(entries, key=lambda e: (e[0].encode("utf-8"), e[1], e[2]))
+    return headwords, ordered
+
+
+def write_index(words: List[VocabEntry], output_file: str) -> Tuple[int, int]:
+    """Build the index for ``words`` and return (headword count, entry count)."""
+    headwords, entries = build_entries(words)
+    pool = bytearray()
+
+    headword_offs = []
+    for word in headwords:
+        headword_offs.append(len(pool))
+        pool += word.encode("utf-8")
+    headword_offs.append(len(pool))
+
+    form_offs = []
+    for form, _, _ in entries:
+        form_offs.append(len(pool))
+        pool += form.encode("utf-8")
+    form_offs.append(len(pool))
+
+    by_headword: List[List[int]] = [[] for _ in headwords]
+    for i, (_, headword, _) in enumerate(entries):
+        by_headword[headword].append(i)
+    reverse_offs, reverse_entries = [0], []
+    for group in by_headword:
+        reverse_entries.extend(group)
+        reverse_offs.append(len(reverse_entries))
+
+    n, m = len(headwords), len(entries)
+    with open(output_file, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, n, m))
+        f.write(struct.pack(f"<{n + 1}I", *headword_offs))
+        f.write(struct.pack(f"<{m + 1}I", *form_offs))
+        f.write(struct.pack(f"<{m}I", *(e[1] for e in entries)))
+        f.write(struct.pack(f"<{n + 1}I", *reverse_offs))
+        f.write(struct.pack(f"<{m}I", *reverse_entries))
+        f.write(bytes(e[2] for e in entries))
+        f.write(pool)
+    return n, m
+
+
+class _PoolKeys:
+    """Sequence of pool strings addressed by an offset table, for bisect."""
+
+    def __init__(self, index: "MorphologyIndex", offsets, length: int):
+        self._index = index
+        self._offsets = offsets
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._index._pool[self._offsets[i]:self._offsets[i + 1]])
+
+
+class MorphologyIndex(MappedFile):
+    """Read-only, memory-mapped view of a file written by :func:`write_index`."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_FILE, cache_size: int = 65536):
+        super().__init__(path)
+
+        magic, version, _flags, n, m = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a morphology index (version {VERSION})")
+
+        self.headword_count, self.entry_count = n, m
+        pos = HEADER.size
+        self._headword_offs = self._uint32_array(pos, n + 1)
+        pos += 4 * (n + 1)
+        self._form_offs = self._uint32_array(pos, m + 1)
+        pos += 4 * (m + 1)
+        self._entry_headword = self._uint32_array(pos, m)
+        pos += 4 * m
+        self._reverse_offs = self._uint32_array(pos, n + 1)
+        pos += 4 * (n + 1)
+        self._reverse_entries = self._uint32_array(pos, m)
+        pos += 4 * m
+        self._entry_kind = self._view[pos:pos + m]
+        self._pool = self._view[pos + m:]
+
+        self._headword_keys = _PoolKeys(self, self._headword_offs, n)
+        self._form_keys = _PoolKeys(self, self._form_offs, m)
+        # Per-instance caches; repeated lookups of common forms skip the search.
+        self.lemmas = lru_cache(maxsize=cache_size)(self._lemmas)
+        self.forms = lru_cache(maxsize=cache_size)(self._forms)
+
+    def _headword(self, index: int) -> str:
+        return self._headword_keys[index].decode("utf-8")
+
+    def _lemmas(self, form: str) -> Tuple[str, ...]:
+        """Return the headwords ``form`` belongs to, the form's own headword first."""
+        key = form.lower().encode("utf-8")
+        i = bisect_left(self._form_keys, key)
+        matches = []
+        while i < self.entry_count and self._form_keys[i] == key:
+            matches.append((self._entry_kind[i], self._headword(self._entry_headword[i])))
+            i += 1
+        # Headword itself, then variants and inflections, derivations last.
+        matches.sort(key=lambda km: (km[0] == KIND_DERIVED, km[0]))
+        found = []
+        for _kind, headword in matches:
+            if headword not in found:
+                found.append(headword)
+        return tuple(found)
+
+    def _forms(self, headword: str) -> Tuple[Tuple[str, int], ...]:
+        """Return every (form, kind) stored for ``headword`` except the headword itself."""
+        key = headword.lower().encode("utf-8")
+        index = bisect_left(self._headword_keys, key)
+        if index >= self.headword_count or self._headword_keys[index] != key:
+            return ()
+        result = []
+        for pos in range(self._reverse_offs[index], self._reverse_offs[index + 1]):
+            entry = self._reverse_entries[pos]
+            kind = self._entry_kind[entry]
+            if kind != KIND_HEADWORD:
+                result.append((self._form_keys[entry].decode("utf-8"), kind))
+        return tuple(sorted(result, key=lambda fk: (fk[1], fk[0])))
+
+    def derivatives(self, headword: str) -> List[Tuple[str, int]]:
+        """Return the forms worth showing a learner: variants, derived headwords
+        and inflections that the regular suffix rules would not predict."""
+        word = headword.lower()
+        forms = self.forms(word)
+        spellings = [word] + [form for form, kind in forms if kind == KIND_VARIANT]
+        predicted = set()
+        for spelling in spellings:
+            if spelling.isalpha():
+                predicted.update(regular_inflections(spelling, adjective=True))
+        return [
+            (form, kind) for form, kind in forms
+            if kind in ATTESTED_KINDS or (form, kind) not in predicted
+        ]
+
+    def lemma(self, form: str) -> Optional[str]:
+        """Return the most likely headword for ``form``, or None."""
+        found = self.lemmas(form)
+        return found[0] if found else None
+
+
+def main():
+    """Build the morphology index, then look up any words given on the command line."""
+    parser = argparse.ArgumentParser(description="Build and query the morphology index.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="binary index file")
+    parser.add_argument("--no-build", action="store_true", help="query an existing index only")
+    parser.add_argument("query", nargs="*", help="forms or headwords to look up")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        n, m = write_index(load_vocabulary(args.words).entries, args.index)
+        print(f"✅ Indexed {m} forms for {n} headwords into {args.index}")
+
+    with MorphologyIndex(args.index) as index:
+        for word in args.query:
+            forms = ", ".join(f"{form} {KIND_LABELS[kind]}" for form, kind in index.forms(word))
+            print(f"{word} → {' / '.join(index.lemmas(word)) or '?'}")
+            if forms:
+                print(f"  forms: {forms}")
+
+
+if __name__ == "__main__":
+    main()
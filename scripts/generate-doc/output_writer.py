@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Write generated documents to a directory, a zip file or a tar.gz archive.
+
+Every writer takes a path relative to the output root and either the text of
+one file (``write_text``) or an iterable of text blocks (``write_blocks``), so
+generators can stream their output, block by block, into a single archive
+instead of creating dozens of loose files. Used as a context manager, a writer is
+closed on exit and a half-written archive is deleted if an error escapes.
+"""
+
+import abc
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import Iterable
+
+BUFFER_SIZE = 1 << 16
+# A tar member's size is written before its data, so tar members are spooled
+# first; spools larger than this move from memory to a temporary file.
+SPOOL_SIZE = 1 << 22
+
+
+class OutputWriter(abc.ABC):
+    """Shared close/cleanup behaviour; ``archive_path`` is None for loose files.
+
+    Subclasses must implement ``write_blocks``; a writer missing it fails when
+    it is created instead of halfway through an archive.
+    """
+
+    archive_path = None
+
+    def write_text(self, relative_path: str, text: str) -> str:
+        return self.write_blocks(relative_path, (text,))
+
+    @abc.abstractmethod
+    def write_blocks(self, relative_path: str, blocks: Iterable[str]) -> str:
+        """Write ``blocks`` as one document and return where it went."""
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None and self.archive_path and os.path.exists(self.archive_path):
+            os.remove(self.archive_path)
+
+
+class DirectoryWriter(OutputWriter):
+    """Write each document as a loose file under ``root``."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def write_blocks(self, relative_path: str, blocks: Iterable[str]) -> str:
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+            f.writelines(blocks)
+        return path
+
+
+class ZipWriter(OutputWriter):
+    """Deflate each document straight into a zip member as it is written."""
+
+    def __init__(self, archive_path: str, root: str):
+        self.archive_path = archive_path
+        self.root = root
+        self._zip = zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+
+    def write_blocks(self, relative_path: str, blocks: Iterable[str]) -> str:
+        name = f"{self.root}/{relative_path.replace(os.sep, '/')}"
+        with self._zip.open(name, 'w') as member:
+            for block in blocks:
+                member.write(block.encode('utf-8'))
+        return f"{self.archive_path}:{name}"
+
+    def close(self):
+        self._zip.close()
+
+
+class TarGzWriter(OutputWriter):
+    """Append each document to a gzip-compressed tar stream."""
+
+    def __init__(self, archive_path: str, root: str):
+        self.archive_path = archive_path
+        self.root = root
+        self._tar = tarfile.open(archive_path, 'w:gz', compresslevel=9)
+
+    def write_blocks(self, relative_path: str, blocks: Iterable[str]) -> str:
+        name = f"{self.root}/{relative_path.replace(os.sep, '/')}"
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            for block in blocks:
+                spool.write(block.encode('utf-8'))
+            info = tarfile.TarInfo(name)
+            info.size = spool.tell()
+            info.mtime = int(time.time())
+            spool.seek(0)
+            self._tar.addfile(info, spool)
+        return f"{self.archive_path}:{name}"
+
+    def close(self):
+        self._tar.close()
+
+
+def open_writer(output_dir: str, archive_path: str = None):
+    """Pick a writer from the archive extension, or fall back to a directory."""
+    if not archive_path:
+        return DirectoryWriter(output_dir)
+    root = os.path.basename(os.path.normpath(output_dir))
+    if archive_path.endswith('.zip'):
+        return ZipWriter(archive_path, root)
+    if archive_path.endswith(('.tar.gz', '.tgz')):
+        return TarGzWriter(archive_path, root)
+    raise ValueError(f"Unsupported archive format: {archive_path} (use .zip or .tar.gz)")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Export the 500-word netem_full_list_partN.md study tables and their
+``_simple`` heading versions straight from the word list.
+
+This produces the same files as json_to_markdown.py, split_md_by_words.py
+and a.py run in sequence, but each part can be rendered on its own. The
+熟悉度 (familiarity) marks already filled into a part file are kept.
+"""
+
+import argparse
+import math
+import os
+from typing import Dict, List, Optional
+
+from records import DEFAULT_WORD_LIST, VocabEntry, load_vocabulary
+
+DEFAULT_PARTS_DIR = "../.."
+PART_PREFIX = "netem_full_list_part"
+WORDS_PER_PART = 500
+
+TABLE_HEADER = "| 序号 | 词频 | 单词 | 释义 | 其他拼写 |\n| --- | --- | --- | --- | --- |\n"
+PART_HEADER = "| 序号 | 词频 | 单词 | 释义 | 其他拼写  | 熟悉度(0/1/2) |\n| --- | --- | --- | --- | --- | --- |\n"
+
+
+def part_count(word_count: int) -> int:
+    return math.ceil(word_count / WORDS_PER_PART)
+
+
+def part_paths(parts_dir: str, part_num: int) -> List[str]:
+    """Paths of the table and simple file of a part (1-based)."""
+    prefix = os.path.join(parts_dir, f"{PART_PREFIX}{part_num}")
+    return [f"{prefix}.md", f"{prefix}_simple.md"]
+
+
+def _cells(entry: VocabEntry) -> str:
+    return f"{entry.rank} | {entry.frequency} | {entry.word} | {entry.definition} | {entry.variant}"
+
+
+def render_full_table(title: str, words: List[VocabEntry]) -> str:
+    """The netem_full_list.md table written by json_to_markdown.py."""
+    return f"# {title}\n\n" + TABLE_HEADER + "".join(f"| {_cells(entry)} |\n" for entry in words) + "\n"
+
+
+def read_familiarity(part_file: str) -> Dict[int, str]:
+    """Return ``{序号: mark}`` for the rows of an existing part file that have a mark."""
+    marks = {}
+    try:
+        with open(part_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                cols = [c.strip() for c in line.strip().strip('|').split('|')]
+                if len(cols) >= 6 and cols[0].isdigit() and cols[-1]:
+                    marks[int(cols[0])] = cols[-1]
+    except FileNotFoundError:
+        pass
+    return marks
+
+
+def render_part(words: List[VocabEntry], familiarity: Optional[Dict[int, str]] = None) -> str:
+    """One part table with its 熟悉度 column."""
+    familiarity = familiarity or {}
+    return PART_HEADER + "".join(
+        f"| {_cells(entry)}  | {familiarity.get(entry.rank, ' ')} |\n" for entry in words
+    )
+
+
+def render_simple_part(words: List[VocabEntry]) -> str:
+    """The heading-per-word layout written by a.py."""
+    lines = []
+    for entry in words:
+        lines.append(f"### {entry.rank} {entry.word}\n{entry.definition}\n")
+        if entry.variant and entry.variant.lower() != "none":
+            lines.append(f"其他拼写: {entry.variant}\n")
+        lines.append("\n")
+    return "".join(lines)
+
+
+def write_part(words: List[VocabEntry], part_num: int, parts_dir: str = DEFAULT_PARTS_DIR) -> List[str]:
+    """Render part ``part_num`` (1-based) of the word list and return the files written."""
+    chunk = words[(part_num - 1) * WORDS_PER_PART:part_num * WORDS_PER_PART]
+    table_file, simple_file = part_paths(parts_dir, part_num)
+    table = render_part(chunk, read_familiarity(table_file))
+    for path, text in ((table_file, table), (simple_file, render_simple_part(chunk))):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return [table_file, simple_file]
+
+
+def write_full_table(title: str, words: List[VocabEntry], parts_dir: str = DEFAULT_PARTS_DIR) -> str:
+    output_file = os.path.join(parts_dir, "netem_full_list.md")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(render_full_table(title, words))
+    return output_file
+
+
+def main():
+    """Export the full table and every part."""
+    parser = argparse.ArgumentParser(description="Export netem_full_list.md and its 500-word parts.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--output", default=DEFAULT_PARTS_DIR, help="directory for the Markdown files")
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary(args.words)
+    words = vocabulary.entries
+    write_full_table(vocabulary.title, words, args.output)
+    for part_num in range(1, part_count(len(words)) + 1):
+        for path in write_part(words, part_num, args.output):
+            print(f"已生成 {path}")
+
+
+if __name__ == "__main__":
+    main()
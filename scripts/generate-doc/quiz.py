@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Generate multiple-choice vocabulary quizzes and test papers.
+
+Each item shows a 释义 as the stem and asks for the matching word. The
+distractors come from the same 90-word frequency band (the chapter split of
+split_json.py) and, when a confusables.py neighbor table is given, from the
+stem's confusable words. A distractor never shares the stem's 释义 (the list
+has hundreds of repeated 释义), so every item has exactly one correct answer.
+Band membership, definition ids and neighbors are precomputed as
+NumPy arrays so whole batches of items are sampled at once with a seeded
+generator: the same seed always produces the same paper.
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from helpers import parse_range
+from records import DEFAULT_WORD_LIST, VocabEntry, load_vocabulary
+
+WORDS_PER_BAND = 90
+DISTRACTORS = 3
+CONFUSABLE_RATE = 0.5
+
+
+class QuizEngine:
+    """Precomputed band and neighbor arrays plus a vectorized item sampler."""
+
+    def __init__(self, words: List[VocabEntry], confusables: Optional[Dict[str, List[List[Any]]]] = None,
+                 words_per_band: int = WORDS_PER_BAND, distractors: int = DISTRACTORS):
+        self.words = sorted(words, key=lambda item: item.rank)
+        self.distractors = distractors
+        count = len(self.words)
+
+        # Word ids are positions in the 序号 order, so band b is the slice
+        # [b * words_per_band, (b + 1) * words_per_band).
+        ids = np.arange(count)
+        self.band_of = ids // words_per_band
+        self.band_start = self.band_of * words_per_band
+        self.band_size = np.minimum(self.band_start + words_per_band, count) - self.band_start
+
+        # Words with equal 释义 share a definition id and can never be each other's distractors.
+        _, self.definition_id = np.unique([item.definition for item in self.words], return_inverse=True)
+        # Band offsets of every word's same-definition band mates (itself included), sorted and
+        # padded with a sentinel no drawn offset reaches.
+        same = [
+            np.flatnonzero(self.definition_id[start:start + size] == self.definition_id[i])
+            for i, (start, size) in enumerate(zip(self.band_start.tolist(), self.band_size.tolist()))
+        ]
+        self.same_definition = np.full((count, max((len(o) for o in same), default=1)), np.iinfo(np.int64).max)
+        for i, offsets in enumerate(same):
+            self.same_definition[i, :len(offsets)] = offsets
+        self.same_definition_count = np.array([len(o) for o in same], dtype=np.int64)
+        if (self.band_size - self.same_definition_count).min() < distractors:
+            raise ValueError(f"bands need {distractors} words with another 释义 for {distractors} distractors")
+
+        # Neighbor table as a padded (count, width) array, -1 for empty slots.
+        position = {item.word: i for i, item in enumerate(self.words)}
+        neighbor_lists = [
+            [position[n[0]] for n in (confusables or {}).get(item.word, [])
+             if n[0] in position and self.definition_id[position[n[0]]] != self.definition_id[i]]
+            for i, item in enumerate(self.words)
+        ]
+        width = max((len(n) for n in neighbor_lists), default=0) or 1
+        self.neighbors = np.full((count, width), -1, dtype=np.int64)
+        for i, neighbor_ids in enumerate(neighbor_lists):
+            self.neighbors[i, :len(neighbor_ids)] = neighbor_ids
+        self.neighbor_count = (self.neighbors >= 0).sum(axis=1)
+
+        self.word_text = np.array([item.word for item in self.words], dtype=object)
+        self.definition_text = np.array([item.definition for item in self.words], dtype=object)
+
+    def _band_distractors(self, rng: np.random.Generator, stems: np.ndarray) -> np.ndarray:
+        """Draw distinct same-band distractors for every stem, excluding the stem and every
+        band mate with the stem's 释义."""
+        n = len(stems)
+        available = self.band_size[stems] - self.same_definition_count[stems]
+        # Excluded offsets inside the band, kept sorted per row.
+        excluded = self.same_definition[stems]
+        picks = np.empty((n, self.distractors), dtype=np.int64)
+        for j in range(self.distractors):
+            offset = (rng.random(n) * (available - j)).astype(np.int64)
+            # Skip over already excluded offsets so the draw stays uniform.
+            for col in range(excluded.shape[1]):
+                offset += offset >= excluded[:, col]
+            picks[:, j] = offset
+            excluded = np.sort(np.concatenate([excluded, offset[:, None]], axis=1), axis=1)
+        return picks + self.band_start[stems][:, None]
+
+    def _mix_confusables(self, rng: np.random.Generator, stems: np.ndarray, picks: np.ndarray,
+                         rate: float) -> np.ndarray:
+        """Replace the first distractor with a confusable neighbor for a share of the items
+        (neighbors with the stem's 释义 were left out of the table)."""
+        counts = self.neighbor_count[stems]
+        use = (counts > 0) & (rng.random(len(stems)) < rate)
+        if not use.any():
+            return picks
+        column = (rng.random(len(stems)) * np.maximum(counts, 1)).astype(np.int64)
+        neighbor = self.neighbors[stems, column]
+        # Never duplicate an option that is already present.
+        use &= ~(picks == neighbor[:, None]).any(axis=1)
+        picks = picks.copy()
+        picks[use, 0] = neighbor[use]
+        return picks
+
+    def sample(self, seed: int, count: int, pool: Optional[np.ndarray] = None,
+               unique_stems: bool = True, confusable_rate: float = CONFUSABLE_RATE) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(options, answers)``: word ids of shape (count, distractors + 1) and the
+        column of the correct option in each row. ``pool`` limits the stems to some word ids."""
+        rng = np.random.default_rng(seed)
+        pool = np.arange(len(self.words)) if pool is None else np.asarray(pool)
+        if unique_stems:
+            if count > len(pool):
+                raise ValueError(f"cannot draw {count} unique stems from {len(pool)} words")
+            stems = rng.choice(pool, size=count, replace=False)
+        else:
+            stems = pool[rng.integers(0, len(pool), size=count)]
+
+        picks = self._band_distractors(rng, stems)
+        if confusable_rate > 0:
+            picks = self._mix_confusables(rng, stems, picks, confusable_rate)
+
+        options = np.concatenate([stems[:, None], picks], axis=1)
+        order = np.argsort(rng.random(options.shape), axis=1)
+        options = np.take_along_axis(options, order, axis=1)
+        answers = np.argmax(order == 0, axis=1)
+        return options, answers
+
+    def to_items(self, options: np.ndarray, answers: np.ndarray) -> List[Dict[str, Any]]:
+        """Turn sampled arrays into JSON-ready quiz items."""
+        stems = options[np.arange(len(options)), answers]
+        words = self.word_text[options]
+        definitions = self.definition_text[stems]
+        return [
+            {
+                "序号": self.words[stem].rank,
+                "题干": definition,
+                "选项": list(row),
+                "答案": "ABCDEFGH"[answer],
+            }
+            for stem, definition, row, answer in zip(stems.tolist(), definitions, words.tolist(), answers.tolist())
+        ]
+
+    def chapter_pool(self, first: int, last: int) -> np.ndarray:
+        """Word ids of chapters ``first`` to ``last`` (1-based, inclusive)."""
+        return np.flatnonzero((self.band_of >= first - 1) & (self.band_of <= last - 1))
+
+    def paper(self, seed: int, count: int, chapters: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """One reproducible test paper of ``count`` items with distinct stems."""
+        pool = self.chapter_pool(*chapters) if chapters else None
+        return self.to_items(*self.sample(seed, count, pool))
+
+
+def main():
+    """Print a test paper, write a batch of papers, or measure throughput."""
+    parser = argparse.ArgumentParser(description="Generate multiple-choice vocabulary quizzes.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--confusables", metavar="TABLE", help="neighbor table from confusables.py")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--items", type=int, default=20, help="items per paper")
+    parser.add_argument("--chapters", type=parse_range, help="limit stems to chapters, e.g. 1-5")
+    parser.add_argument("--papers", type=int, default=1, help="number of papers (seeds seed..seed+N-1)")
+    parser.add_argument("--output", metavar="DIR", help="write papers as JSON files instead of printing")
+    parser.add_argument("--benchmark", action="store_true", help="measure items sampled per second")
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary(args.words)
+    confusables = None
+    if args.confusables:
+        with open(args.confusables, 'r', encoding='utf-8') as f:
+            confusables = json.load(f)
+    engine = QuizEngine(vocabulary.entries, confusables)
+
+    if args.benchmark:
+        batch = 100_000
+        start = time.perf_counter()
+        engine.sample(args.seed, batch, unique_stems=False)
+        sampled = time.perf_counter() - start
+        start = time.perf_counter()
+        engine.to_items(*engine.sample(args.seed, batch, unique_stems=False))
+        formatted = time.perf_counter() - start
+        print(f"⚡ {batch / sampled:,.0f} items/s sampled, {batch / formatted:,.0f} items/s as JSON-ready dicts")
+        return
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    for seed in range(args.seed, args.seed + args.papers):
+        items = engine.paper(seed, args.items, args.chapters)
+        if args.output:
+            output_file = os.path.join(args.output, f"paper_{seed}.json")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump({"seed": seed, "items": items}, f, ensure_ascii=False, indent=2)
+        else:
+            print(f"# 📝 试卷 (seed {seed})\n")
+            for number, item in enumerate(items, 1):
+                options = "  ".join(f"{'ABCDEFGH'[k]}. {word}" for k, word in enumerate(item["选项"]))
+                print(f"{number}. {item['题干']}\n   {options}    答案: {item['答案']}")
+    if args.output:
+        print(f"✅ Wrote {args.papers} papers to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Typed records for the vocabulary list and the chapter JSON files.
+
+``load_vocabulary`` and ``load_chapter`` decode every JSON object as its raw
+key/value pairs (``object_pairs_hook``), then build ``__slots__`` objects for
+the objects that sit at row positions in the word list, so no per-row dict is
+kept and key order does not matter. Every row is validated before returning,
+so a malformed row is reported with its row number instead of surfacing later
+as a KeyError deep inside rendering.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+DEFAULT_WORD_LIST = "../../netem_full_list.json"
+DEFAULT_TITLE = "5530考研词汇词频排序表"
+
+# JSON key -> attribute, in the order netem_full_list.json writes them.
+ENTRY_FIELDS = (
+    ("序号", "rank"),
+    ("词频", "frequency"),
+    ("单词", "word"),
+    ("释义", "definition"),
+    ("其他拼写", "variant"),
+    ("主题", "topic"),
+)
+_ATTRIBUTE_OF = dict(ENTRY_FIELDS)
+_EXPORT_KEYS = tuple(key for key, _ in ENTRY_FIELDS[:5])
+_CHAPTER_KEYS = tuple(key for key, _ in ENTRY_FIELDS)
+_MISSING = object()
+
+
+class VocabularyFormatError(ValueError):
+    """Raised when a word list or chapter file does not match the expected schema."""
+
+
+class VocabEntry:
+    """One row of the word list."""
+
+    __slots__ = ("rank", "frequency", "word", "definition", "variant", "topic", "extra")
+
+    def __init__(self, rank: int, frequency: int, word: str, definition: str,
+                 variant: Optional[str] = None, topic: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.rank = rank
+        self.frequency = frequency
+        self.word = word
+        self.definition = definition
+        self.variant = variant
+        self.topic = topic
+        # Keys added by later stages (e.g. enrichment results), kept verbatim.
+        self.extra = extra
+
+    @classmethod
+    def from_pairs(cls, pairs: List[tuple]) -> "VocabEntry":
+        """Build an entry from a row's key/value pairs, in any key order."""
+        keys = tuple([key for key, _ in pairs])
+        if keys == _EXPORT_KEYS or keys == _CHAPTER_KEYS:
+            # Fast path for rows in the exact export (5 keys) or chapter (6 keys) layout.
+            return cls(*[value for _, value in pairs])
+        entry = cls.__new__(cls)
+        entry.rank = entry.frequency = entry.word = entry.definition = _MISSING
+        entry.variant = entry.topic = entry.extra = None
+        for key, value in pairs:
+            attribute = _ATTRIBUTE_OF.get(key)
+            if attribute is not None:
+                setattr(entry, attribute, value)
+            else:
+                if entry.extra is None:
+                    entry.extra = {}
+                entry.extra[key] = _plain(value)
+        return entry
+
+    def to_dict(self, with_topic: bool = True) -> Dict[str, Any]:
+        """Return the row in the netem_full_list.json shape (plus 主题 unless ``with_topic`` is off)."""
+        data = {
+            "序号": self.rank,
+            "词频": self.frequency,
+            "单词": self.word,
+            "释义": self.definition,
+            "其他拼写": self.variant,
+        }
+        if with_topic:
+            data["主题"] = self.topic
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VocabEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"VocabEntry({self.rank}, {self.word!r})"
+
+
+def validate_entry(entry: Any, row: int, source: str = "") -> VocabEntry:
+    """Check one decoded row; ``row`` is 1-based and used in the error message."""
+    where = f"{source}: row {row}" if source else f"row {row}"
+    if not isinstance(entry, VocabEntry):
+        raise VocabularyFormatError(f"{where}: expected a word object, got {type(entry).__name__}")
+    for key, attribute in ENTRY_FIELDS[:4]:
+        if getattr(entry, attribute) is _MISSING:
+            raise VocabularyFormatError(f"{where}: missing required field '{key}'")
+    if type(entry.rank) is not int or entry.rank < 1:
+        raise VocabularyFormatError(f"{where}: 序号 must be a positive integer, got {entry.rank!r}")
+    if type(entry.frequency) is not int or entry.frequency < 0:
+        raise VocabularyFormatError(f"{where} (序号 {entry.rank}): 词频 must be a non-negative integer, got {entry.frequency!r}")
+    if not isinstance(entry.word, str) or not entry.word.strip():
+        raise VocabularyFormatError(f"{where} (序号 {entry.rank}): 单词 must be a non-empty string, got {entry.word!r}")
+    if not isinstance(entry.definition, str):
+        raise VocabularyFormatError(f"{where} (序号 {entry.rank}): 释义 must be a string, got {entry.definition!r}")
+    for key, attribute in ENTRY_FIELDS[4:]:
+        value = getattr(entry, attribute)
+        if value is not None and not isinstance(value, str):
+            raise VocabularyFormatError(f"{where} (序号 {entry.rank}): {key} must be a string or null, got {value!r}")
+    return entry
+
+
+class _Pairs(list):
+    """A JSON object as decoded: its (key, value) pairs in file order."""
+
+
+def _plain(value: Any) -> Any:
+    """Turn decoded pairs back into ordinary dicts, recursively."""
+    if type(value) is _Pairs:
+        return {key: _plain(item) for key, item in value}
+    if type(value) is list:
+        return [_plain(item) for item in value]
+    return value
+
+
+def _entry(row: Any) -> Any:
+    """The entry for a row object (decoded pairs or a dict); anything else is left for validation."""
+    if type(row) is _Pairs:
+        return VocabEntry.from_pairs(row)
+    if isinstance(row, dict):
+        return VocabEntry.from_pairs(list(row.items()))
+    return _plain(row)
+
+
+def _decode_rows(rows: Any, source: str) -> List[VocabEntry]:
+    """Build and validate the entries of a decoded word array."""
+    if type(rows) is not list:
+        raise VocabularyFormatError(f"{source}: expected a list of words, got {type(_plain(rows)).__name__}")
+    entries = [_entry(row) for row in rows]
+    for row, entry in enumerate(entries, 1):
+        # One combined check per row; validate_entry works out the message on failure.
+        if not (type(entry) is VocabEntry and type(entry.rank) is int and entry.rank > 0
+                and type(entry.frequency) is int and entry.frequency >= 0
+                and type(entry.word) is str and entry.word.strip() and type(entry.definition) is str
+                and (entry.variant is None or type(entry.variant) is str)
+                and (entry.topic is None or type(entry.topic) is str)):
+            validate_entry(entry, row, source)
+    return entries
+
+
+def _load_pairs(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            return json.load(f, object_pairs_hook=_Pairs)
+        except json.JSONDecodeError as exc:
+            raise VocabularyFormatError(f"{path}: invalid JSON at line {exc.lineno}: {exc.msg}") from exc
+
+
+class Vocabulary:
+    """The whole word list: its title and rows in file order."""
+
+    __slots__ = ("title", "entries")
+
+    def __init__(self, title: str, entries: List[VocabEntry]):
+        self.title = title
+        self.entries = entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # The JSON export has no topic column; only write 主题 once some row carries one.
+        with_topic = any(entry.topic is not None for entry in self.entries)
+        return {self.title: [entry.to_dict(with_topic) for entry in self.entries]}
+
+
+def load_vocabulary(path: str = DEFAULT_WORD_LIST) -> Vocabulary:
+    """Decode and validate netem_full_list.json (or any list in the same shape)."""
+    data = _load_pairs(path)
+    if type(data) is not _Pairs or len(data) != 1:
+        raise VocabularyFormatError(f"{path}: expected one top-level key holding the word list")
+    title, rows = data[0]
+    return Vocabulary(title, _decode_rows(rows, path))
+
+
+def dumps_vocabulary(vocabulary: Vocabulary) -> str:
+    """The list as text in the netem_full_list.json layout."""
+    return json.dumps(vocabulary.to_dict(), ensure_ascii=False, indent=2) + "\n"
+
+
+def save_vocabulary(vocabulary: Vocabulary, path: str):
+    """Write the list back in the netem_full_list.json layout."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps_vocabulary(vocabulary))
+
+
+class ChapterInfo:
+    """The ``chapter_info`` block written by split_json.py and topic_index.py."""
+
+    __slots__ = ("chapter_number", "total_chapters", "words_range", "word_count", "topic", "band")
+
+    def __init__(self, chapter_number: int, total_chapters: int, words_range: str, word_count: int,
+                 topic: Optional[str] = None, band: Optional[str] = None):
+        self.chapter_number = chapter_number
+        self.total_chapters = total_chapters
+        self.words_range = words_range
+        self.word_count = word_count
+        self.topic = topic
+        self.band = band
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "chapter_number": self.chapter_number,
+            "total_chapters": self.total_chapters,
+            "words_range": self.words_range,
+            "word_count": self.word_count,
+        }
+        if self.topic is not None:
+            data["topic"] = self.topic
+            data["band"] = self.band
+        return data
+
+
+class Chapter:
+    """One chapter file: its info block and word rows."""
+
+    __slots__ = ("info", "words")
+
+    def __init__(self, info: ChapterInfo, words: List[VocabEntry]):
+        self.info = info
+        self.words = words
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"chapter_info": self.info.to_dict(), "words": [entry.to_dict() for entry in self.words]}
+
+
+def decode_chapter(data: Any, source: str = "") -> Chapter:
+    """Validate a chapter object, as decoded by ``load_chapter`` or as a plain dict."""
+    fields = dict(data) if type(data) is _Pairs else data if isinstance(data, dict) else {}
+    if "chapter_info" not in fields or "words" not in fields:
+        raise VocabularyFormatError(f"{source}: expected 'chapter_info' and 'words'")
+    info = _plain(fields["chapter_info"])
+    if not isinstance(info, dict):
+        raise VocabularyFormatError(f"{source}: chapter_info must be an object")
+    for key, kind in (("chapter_number", int), ("total_chapters", int), ("words_range", str), ("word_count", int)):
+        if not isinstance(info.get(key), kind):
+            raise VocabularyFormatError(f"{source}: chapter_info.{key} must be {kind.__name__}, got {info.get(key)!r}")
+    words = _decode_rows(fields["words"], source)
+    if len(words) != info["word_count"]:
+        raise VocabularyFormatError(f"{source}: word_count is {info['word_count']} but the chapter has {len(words)} words")
+    return Chapter(
+        ChapterInfo(info["chapter_number"], info["total_chapters"], info["words_range"], info["word_count"],
+                    info.get("topic"), info.get("band")),
+        words,
+    )
+
+
+def load_chapter(path: str) -> Chapter:
+    """Decode and validate a chapter JSON file."""
+    return decode_chapter(_load_pairs(path), path)
+
+
+def save_chapter(chapter: Chapter, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chapter.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    vocabulary = load_vocabulary()
+    print(f"✅ {len(vocabulary)} valid rows in '{vocabulary.title}'")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Annotate 其他拼写 (spelling variants) for the whole word list in one batch.
+
+This is a port of scripts/spelling-variations (bydictionary.json first, then
+the bypattern.js rewrite rules) that computes the variant of every word at
+once and writes the result back in bulk: netem_full_list.json, the
+netem_full_list.sql dump and, optionally, a SQLite copy of the table. All
+outputs are prepared first and only replaced after the SQLite transaction
+commits, so a failure leaves every file as it was.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from records import DEFAULT_WORD_LIST, VocabEntry, dumps_vocabulary, load_vocabulary
+from sql_dump import COLUMNS, DEFAULT_SQL_FILE, INSERT_RE, TABLE_NAME, format_insert, parse_values
+
+DEFAULT_DICTIONARY = "../spelling-variations/lib/bydictionary.json"
+
+# Slots of a variation entry, as in bypattern.js:
+#   0-3: UK1-UK4    4-7: US1-US4    8: common UK/US spelling
+SLOTS = 9
+
+# (pattern, slots keeping the word, slots taking the replacement, replacement);
+# the first matching pattern wins and only its first match is replaced.
+PATTERNS = [
+    (r"ellous$", (0, 5), (4,), "elous"),
+    (r"elous$", (4,), (0, 5), "ellous"),
+    (r"s(ation|ational|ations|ationally)$", (0, 5), (4, 1), r"z\1"),
+    (r"z(ation|ational|ations|ationally)$", (4, 1), (0, 5), r"s\1"),
+    (r"ae", (0, 5), (4,), "e"),
+    (r"(i|y)s(e|ed|er|es|ing|ingly|able|ers)$", (0, 5), (4, 1), r"\1z\2"),
+    (r"(i|y)z(e|ed|er|es|ing|ingly|able|ers)$", (4, 1), (0, 5), r"\1s\2"),
+    (r"([^a])esth", (4, 1), (0, 5), r"\1aesth"),
+    (r"oea", (0, 5), (4, 1), "ea"),
+    (r"^oe", (0, 5), (4,), "e"),
+    (r"fulfil(?!l)", (0, 5), (4,), "fulfill"),
+    (r"fulfill", (4,), (0, 5), "fulfil"),
+    (r"(v|m|b|l|d|i|n|c|g|p)our", (0, 5), (4,), r"\1or"),
+    (r"(m|c)oul", (0, 5), (4,), r"\1ol"),
+    (r"elled$", (0, 5), (4,), "eled"),
+]
+_COMPILED = [(re.compile(pattern), keep, take, replacement) for pattern, keep, take, replacement in PATTERNS]
+
+# Words the rules above get wrong ("could" is not the UK form of "cold").
+PATTERN_EXCEPTIONS = {"could"}
+
+
+class SpellingVariants:
+    """UK/US spelling variation lookup: dictionary entries first, then the rewrite rules."""
+
+    def __init__(self, dictionary_file: str = DEFAULT_DICTIONARY):
+        with open(dictionary_file, 'r', encoding='utf-8') as f:
+            self.dictionary: Dict[str, str] = json.load(f)
+
+    def slots(self, word: str) -> Optional[List[Optional[str]]]:
+        """The nine UK/US slots for ``word`` (lower-cased), or None when it has no variations."""
+        word = word.lower()
+        entry = self.dictionary.get(word)
+        if entry:
+            return [spelling or None for spelling in entry.split("|")]
+        if word in PATTERN_EXCEPTIONS:
+            return None
+        for regex, keep, take, replacement in _COMPILED:
+            if regex.search(word):
+                result: List[Optional[str]] = [None] * SLOTS
+                replaced = regex.sub(replacement, word, count=1)
+                for index in keep:
+                    result[index] = word
+                for index in take:
+                    result[index] = replaced
+                return result
+        return None
+
+    def variants(self, word: str) -> List[str]:
+        """Other spellings of ``word``, without duplicates, in slot order."""
+        slots = self.slots(word)
+        if not slots:
+            return []
+        lower = word.lower()
+        return [s for s in dict.fromkeys(slots) if s and s != lower and s != word]
+
+    def annotate(self, words: List[VocabEntry]) -> Dict[str, str]:
+        """Return ``{单词: 其他拼写}`` for every word that has variations."""
+        table = {}
+        for entry in words:
+            found = self.variants(entry.word)
+            if found:
+                table[entry.word] = ", ".join(found)
+        return table
+
+
+def apply_variants(words: List[VocabEntry], table: Dict[str, str]) -> List[VocabEntry]:
+    """Set 其他拼写 from ``table``; return the entries that changed."""
+    changed = []
+    for entry in words:
+        variant = table.get(entry.word)
+        if variant is not None and entry.variant != variant:
+            entry.variant = variant
+            changed.append(entry)
+    return changed
+
+
+def rewrite_sql_dump(sql_file: str, table: Dict[str, str]) -> Tuple[str, List[VocabEntry], List[VocabEntry]]:
+    """Return the dump text with updated INSERT rows, all of its rows, and the rows that changed."""
+    lines, rows, changed = [], [], []
+    with open(sql_file, 'r', encoding='utf-8', newline='') as f:
+        for line_number, line in enumerate(f, 1):
+            match = INSERT_RE.match(line)
+            if match and match.group("table") == TABLE_NAME:
+                row = VocabEntry(*parse_values(match.group("values"), line_number))
+                rows.append(row)
+                variant = table.get(row.word)
+                if variant is not None and row.variant != variant:
+                    row.variant = variant
+                    changed.append(row)
+                    ending = line[len(line.rstrip("\r\n")):]
+                    line = format_insert(row) + ending
+            lines.append(line)
+    return "".join(lines), rows, changed
+
+
+def write_sqlite(conn: sqlite3.Connection, words: List[VocabEntry]):
+    """Upsert every row into the ``netem_full_list`` table (inside the caller's transaction)."""
+    columns = [column for column, _ in COLUMNS]
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} "
+        f"(id INTEGER PRIMARY KEY, frequency INTEGER, word TEXT, definition TEXT, variant TEXT, topic TEXT)"
+    )
+    conn.executemany(
+        f"INSERT INTO {TABLE_NAME} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(id) DO UPDATE SET "
+        + ", ".join(f"{column} = excluded.{column}" for column in columns[1:]),
+        [tuple(getattr(row, attribute) for _, attribute in COLUMNS) for row in words],
+    )
+
+
+def _replace(path: str, text: str):
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(temp_file, path)
+
+
+def main():
+    """Annotate the whole list and write the variants back."""
+    parser = argparse.ArgumentParser(description="Annotate spelling variants for the whole word list.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--sql", default=DEFAULT_SQL_FILE, help="netem_full_list.sql dump to update")
+    parser.add_argument("--sqlite", metavar="DB", help="also upsert the table into this SQLite database")
+    parser.add_argument("--dictionary", default=DEFAULT_DICTIONARY, help="bydictionary.json")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    annotator = SpellingVariants(args.dictionary)
+    vocabulary = load_vocabulary(args.words)
+    table = annotator.annotate(vocabulary.entries)
+    json_changed = apply_variants(vocabulary.entries, table)
+    sql_text, sql_rows, sql_changed = None, [], []
+    if os.path.exists(args.sql):
+        sql_text, sql_rows, sql_changed = rewrite_sql_dump(args.sql, table)
+
+    for entry in json_changed:
+        print(f"  {entry.rank} {entry.word} → {entry.variant}")
+    print(f"🔤 {len(table)} words have variants; {len(json_changed)} JSON rows and "
+          f"{len(sql_changed)} dump rows change")
+    if args.dry_run:
+        return
+
+    if args.sqlite:
+        conn = sqlite3.connect(args.sqlite)
+        try:
+            with conn:
+                # The dump also carries 主题, so mirror it when there is one.
+                write_sqlite(conn, sql_rows or vocabulary.entries)
+        finally:
+            conn.close()
+    if json_changed:
+        _replace(args.words, dumps_vocabulary(vocabulary))
+    if sql_changed:
+        _replace(args.sql, sql_text)
+    print(f"✅ Wrote back in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,25 @@ Split the main netem_full_list.json into smaller JSON files for each chapter.
 Each chapter contains 90 words (3 sections of 30 words each).
 """
 
-import json
 import os
 import math
+from typing import List
+
+from enrich import DEFAULT_RESULTS_FILE, apply_enrichment, load_enrichment
+from records import Chapter, ChapterInfo, VocabEntry, load_vocabulary, save_chapter
+from sql_dump import merge_topics
+
+WORDS_PER_CHAPTER = 90
+
+def make_chapter(words: List[VocabEntry], chapter_num: int, words_per_chapter: int = WORDS_PER_CHAPTER) -> Chapter:
+    """Return chapter ``chapter_num`` (1-based) of the word list."""
+    total_chapters = math.ceil(len(words) / words_per_chapter)
+    start_idx = (chapter_num - 1) * words_per_chapter
+    end_idx = min(start_idx + words_per_chapter, len(words))
+    return Chapter(
+        ChapterInfo(chapter_num, total_chapters, f"{start_idx + 1}-{end_idx}", end_idx - start_idx),
+        words[start_idx:end_idx],
+    )
 
 def split_json_into_chapters():
     """Split the main JSON file into chapter-based JSON files."""
@@ -14,14 +30,19 @@ def split_json_into_chapters():
     # Read the main JSON file
     input_file = "../../netem_full_list.json"
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    vocabulary = load_vocabulary(input_file)
     
-    words = data["5530考研词汇词频排序表"]
+    # The JSON export has no topic column; take 主题 from the SQL dump
+    words = merge_topics(vocabulary.entries)
     print(f"Total words to process: {len(words)}")
     
+    # Re-apply the enrichment checkpoint so regenerated chapters keep the enriched fields
+    enriched = apply_enrichment(words, load_enrichment(DEFAULT_RESULTS_FILE))
+    if enriched:
+        print(f"Applied enriched fields from {DEFAULT_RESULTS_FILE} to {enriched} words")
+    
     # Calculate number of chapters (90 words per chapter)
-    words_per_chapter = 90
+    words_per_chapter = WORDS_PER_CHAPTER
     total_chapters = math.ceil(len(words) / words_per_chapter)
     
     print(f"Will create {total_chapters} chapters with {words_per_chapter} words each")
@@ -32,28 +53,14 @@ def split_json_into_chapters():
     
     # Split words into chapters
     for chapter_num in range(1, total_chapters + 1):
-        start_idx = (chapter_num - 1) * words_per_chapter
-        end_idx = min(start_idx + words_per_chapter, len(words))
-        
-        chapter_words = words[start_idx:end_idx]
-        
         # Create chapter data structure
-        chapter_data = {
-            "chapter_info": {
-                "chapter_number": chapter_num,
-                "total_chapters": total_chapters,
-                "words_range": f"{start_idx + 1}-{end_idx}",
-                "word_count": len(chapter_words)
-            },
-            "words": chapter_words
-        }
+        chapter_data = make_chapter(words, chapter_num, words_per_chapter)
         
         # Save to file
         output_file = os.path.join(output_dir, f"chapter_{chapter_num:02d}.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(chapter_data, f, ensure_ascii=False, indent=2)
+        save_chapter(chapter_data, output_file)
         
-        print(f"Created {output_file} with {len(chapter_words)} words (序号 {start_idx + 1}-{end_idx})")
+        print(f"Created {output_file} with {len(chapter_data.words)} words (序号 {chapter_data.info.words_range})")
     
     print(f"\nSuccessfully created {total_chapters} chapter JSON files in '{output_dir}' directory")
     
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Read and write the rows of netem_full_list.sql without a MySQL server.
+
+The dump holds one ``INSERT INTO `netem_full_list` VALUES (...)`` statement
+per word. Rows are returned as records.VocabEntry objects, including the
+``主题`` (topic) column that the JSON export does not carry.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from records import VocabEntry, VocabularyFormatError, validate_entry
+
+DEFAULT_SQL_FILE = "../../netem_full_list.sql"
+TABLE_NAME = "netem_full_list"
+
+# Dump column -> VocabEntry attribute, in table order.
+COLUMNS = [
+    ("id", "rank"),
+    ("frequency", "frequency"),
+    ("word", "word"),
+    ("definition", "definition"),
+    ("variant", "variant"),
+    ("topic", "topic"),
+]
+
+INSERT_RE = re.compile(r"^INSERT INTO `(?P<table>\w+)` VALUES \((?P<values>.*)\);\s*$")
+VALUE_RE = re.compile(r"""\s*(?:(?P<null>NULL)|(?P<number>-?\d+)|'(?P<single>(?:[^'\\]|\\.|'')*)'|"(?P<double>(?:[^"\\]|\\.|"")*)")\s*(?:,|$)""")
+
+
+def _unescape(value: str, quote: str) -> str:
+    value = value.replace(quote * 2, quote)
+    return re.sub(r"\\(.)", lambda m: {"n": "\n", "t": "\t", "0": "\0"}.get(m.group(1), m.group(1)), value)
+
+
+def parse_values(values: str, line_number: int = 0) -> List[Any]:
+    """Parse the comma-separated literals of one VALUES tuple."""
+    result, pos = [], 0
+    while pos < len(values):
+        match = VALUE_RE.match(values, pos)
+        if not match:
+            raise ValueError(f"line {line_number}: cannot parse SQL values near {values[pos:pos + 30]!r}")
+        if match.group("null"):
+            result.append(None)
+        elif match.group("number") is not None:
+            result.append(int(match.group("number")))
+        elif match.group("single") is not None:
+            result.append(_unescape(match.group("single"), "'"))
+        else:
+            result.append(_unescape(match.group("double"), '"'))
+        pos = match.end()
+    return result
+
+
+def iter_rows(sql_file: str = DEFAULT_SQL_FILE) -> Iterator[VocabEntry]:
+    """Yield every row of the dump as a validated VocabEntry."""
+    with open(sql_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            match = INSERT_RE.match(line)
+            if not match or match.group("table") != TABLE_NAME:
+                continue
+            values = parse_values(match.group("values"), line_number)
+            if len(values) != len(COLUMNS):
+                raise VocabularyFormatError(f"{sql_file}: line {line_number}: expected {len(COLUMNS)} values, got {len(values)}")
+            yield validate_entry(VocabEntry(*values), line_number, sql_file)
+
+
+def read_rows(sql_file: str = DEFAULT_SQL_FILE) -> List[VocabEntry]:
+    """Return every row of the dump, ordered by 序号."""
+    return sorted(iter_rows(sql_file), key=lambda row: row.rank)
+
+
+def format_value(value: Any) -> str:
+    """Format a Python value as a MySQL literal in the style of the dump."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    text = str(value).replace("\\", "\\\\")
+    if "'" in text and '"' not in text:
+        return f'"{text}"'
+    return "'" + text.replace("'", "\\'") + "'"
+
+
+def format_insert(row: VocabEntry) -> str:
+    """Return the INSERT statement for one row."""
+    values = ", ".join(format_value(getattr(row, attribute)) for _, attribute in COLUMNS)
+    return f"INSERT INTO `{TABLE_NAME}` VALUES ({values});"
+
+
+def load_topics(sql_file: str = DEFAULT_SQL_FILE) -> Dict[int, Optional[str]]:
+    """Return ``{序号: 主题}`` for every row of the dump."""
+    return {row.rank: row.topic for row in iter_rows(sql_file)}
+
+
+def merge_topics(words: List[VocabEntry], sql_file: str = DEFAULT_SQL_FILE,
+                 topics: Optional[Dict[int, Optional[str]]] = None) -> List[VocabEntry]:
+    """Fill in 主题 from the dump (or an already loaded ``topics`` map) for word lists exported without it."""
+    if all(item.topic is not None for item in words):
+        return words
+    if topics is None:
+        topics = load_topics(sql_file)
+    for item in words:
+        if item.topic is None:
+            item.topic = topics.get(item.rank)
+    return words
+
+
+if __name__ == "__main__":
+    rows = read_rows()
+    print(json.dumps([row.to_dict() for row in rows[:3]], ensure_ascii=False, indent=2))
+    print(f"Parsed {len(rows)} rows, {sum(1 for r in rows if r.topic)} with a topic")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Build a topic -> frequency band -> ranked word index and generate topic chapters.
+
+The index is computed once from the word list (主题 comes from the SQL dump
+when the JSON export lacks it). Topic chapters and study sets are then cut
+straight from the precomputed id lists instead of re-filtering the whole
+list for every topic and band combination.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from records import DEFAULT_WORD_LIST, Chapter, ChapterInfo, VocabEntry, load_vocabulary, save_chapter
+from sql_dump import DEFAULT_SQL_FILE, merge_topics
+
+DEFAULT_INDEX_FILE = "topic_index.json"
+DEFAULT_OUTPUT_DIR = "topic_chapter_jsons"
+WORDS_PER_CHAPTER = 90
+UNCATEGORIZED = "uncategorized"
+
+# (band name, minimum 词频); the first 2444 words appear 40+ times in the papers.
+FREQUENCY_BANDS = [
+    ("高频", 40),
+    ("中频", 10),
+    ("低频", 1),
+    ("零频", 0),
+]
+
+
+def frequency_band(frequency: int) -> str:
+    """Return the name of the band a 词频 value falls into."""
+    for name, minimum in FREQUENCY_BANDS:
+        if frequency >= minimum:
+            return name
+    return FREQUENCY_BANDS[-1][0]
+
+
+def topic_slug(topic: str) -> str:
+    """File-system friendly form of a topic name ('people: actions' -> 'people_actions')."""
+    return re.sub(r"[^0-9A-Za-z一-鿿]+", "_", topic).strip("_")
+
+
+class TopicIndex:
+    """Word ids (positions in the word list) grouped by topic and band, in rank order."""
+
+    def __init__(self, topics: Dict[str, Dict[str, List[int]]], word_count: int):
+        self.topics = topics
+        self.word_count = word_count
+
+    @classmethod
+    def build(cls, words: List[VocabEntry]) -> "TopicIndex":
+        order = sorted(range(len(words)), key=lambda i: words[i].rank)
+        topics: Dict[str, Dict[str, List[int]]] = {}
+        for i in order:
+            topic = words[i].topic or UNCATEGORIZED
+            band = frequency_band(words[i].frequency)
+            topics.setdefault(topic, {}).setdefault(band, []).append(i)
+        return cls(topics, len(words))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_FILE) -> "TopicIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data["topics"], data["word_count"])
+
+    def save(self, path: str = DEFAULT_INDEX_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"word_count": self.word_count, "topics": self.topics}, f, ensure_ascii=False)
+
+    def topic_names(self) -> List[str]:
+        """Topics by size, largest first."""
+        return sorted(self.topics, key=lambda t: (-sum(len(ids) for ids in self.topics[t].values()), t))
+
+    def word_ids(self, topic: str, band: Optional[str] = None) -> List[int]:
+        """Rank-ordered ids for a topic, optionally limited to one band."""
+        bands = self.topics.get(topic, {})
+        if band is not None:
+            return bands.get(band, [])
+        # Ids are positions in the 序号-ordered list, so merging the bands keeps rank order.
+        return list(heapq.merge(*bands.values()))
+
+
+def chapter_records(words: List[VocabEntry], ids: List[int], topic: str,
+                    band: Optional[str] = None, words_per_chapter: int = WORDS_PER_CHAPTER) -> List[Chapter]:
+    """Cut a rank-ordered id list into chapters in the split_json.py format."""
+    total_chapters = math.ceil(len(ids) / words_per_chapter)
+    chapters = []
+    for chapter_num in range(1, total_chapters + 1):
+        start = (chapter_num - 1) * words_per_chapter
+        chunk = ids[start:start + words_per_chapter]
+        chapters.append(Chapter(
+            ChapterInfo(chapter_num, total_chapters, f"{start + 1}-{start + len(chunk)}", len(chunk), topic, band),
+            [words[i] for i in chunk],
+        ))
+    return chapters
+
+
+def generate_topic_chapters(words: List[VocabEntry], index: TopicIndex, output_dir: str,
+                            by_band: bool = False) -> List[Dict[str, Any]]:
+    """Write topic chapter JSON files and return the study set summary."""
+    study_sets = []
+    for topic in index.topic_names():
+        bands = [name for name, _ in FREQUENCY_BANDS if name in index.topics[topic]] if by_band else [None]
+        for band in bands:
+            ids = index.word_ids(topic, band)
+            folder = topic_slug(topic) + (f"_{band}" if band else "")
+            chapters = chapter_records(words, ids, topic, band)
+            os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+            for chapter in chapters:
+                output_file = os.path.join(output_dir, folder, f"chapter_{chapter.info.chapter_number:02d}.json")
+                save_chapter(chapter, output_file)
+            study_sets.append({
+                "topic": topic,
+                "band": band,
+                "folder": folder,
+                "chapters": len(chapters),
+                "words": [words[i].word for i in ids],
+            })
+    with open(os.path.join(output_dir, "study_sets.json"), 'w', encoding='utf-8') as f:
+        json.dump(study_sets, f, ensure_ascii=False, indent=2)
+    return study_sets
+
+
+def main():
+    """Build the topic index and write topic-based chapters and study sets."""
+    parser = argparse.ArgumentParser(description="Generate topic-based chapters from the SQL topic column.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--sql", default=DEFAULT_SQL_FILE, help="dump supplying 主题 when the JSON lacks it")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="where to save the topic index")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--by-band", action="store_true", help="one chapter set per topic and frequency band")
+    parser.add_argument("--markdown", metavar="DIR", help="also render the chapters to Markdown in DIR")
+    args = parser.parse_args()
+
+    words = merge_topics(load_vocabulary(args.words).entries, args.sql)
+
+    index = TopicIndex.build(words)
+    index.save(args.index)
+    print(f"✅ Indexed {len(index.topics)} topics into {args.index}")
+
+    study_sets = generate_topic_chapters(words, index, args.output, args.by_band)
+    print(f"📁 Wrote {sum(s['chapters'] for s in study_sets)} chapters for {len(study_sets)} study sets to '{args.output}'")
+
+    if args.markdown:
+        from generate_markdown import VocabularyMarkdownGenerator
+        generator = VocabularyMarkdownGenerator()
+        for study_set in study_sets:
+            folder = os.path.join(args.output, study_set["folder"])
+            for name in sorted(os.listdir(folder)):
+                generator.generate_chapter_markdown(os.path.join(folder, name),
+                                                    os.path.join(args.markdown, study_set["folder"]))
+        print(f"📋 Rendered Markdown into '{args.markdown}'")
+
+
+if __name__ == "__main__":
+    main()
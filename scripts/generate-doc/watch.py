@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Watch netem_full_list.json and netem_full_list.sql and rebuild on edits.
+
+The parsed word list, the SQL topic map, the enrichment results written by
+enrich.py and the Markdown generator (with its phonetic data) stay loaded
+between edits. Enriched fields are re-applied to every reload, so chapters
+regenerated here keep them. When a source file changes and
+then stays unchanged for the debounce delay, the list is reloaded, diffed
+row by row against the previous copy, and only the chapters and parts that
+contain changed rows are rewritten:
+
+    chapter_jsons/chapter_XX.json       as written by split_json.py
+    vocabulary_markdown/.../第N章.md     as written by generate_markdown.py
+    netem_full_list.md and its parts    as written by parts.py
+
+Files are polled with os.stat, so the watcher has no dependencies and works
+the same on every platform and on network mounts.
+"""
+
+import argparse
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from enrich import DEFAULT_RESULTS_FILE, apply_enrichment, load_enrichment
+from generate_markdown import BOOK_BUFFER_SIZE, VocabularyMarkdownGenerator
+from parts import DEFAULT_PARTS_DIR, WORDS_PER_PART, part_count, part_paths, write_full_table, write_part
+from records import DEFAULT_WORD_LIST, VocabEntry, load_vocabulary, save_chapter
+from split_json import WORDS_PER_CHAPTER, make_chapter
+from sql_dump import DEFAULT_SQL_FILE, load_topics, merge_topics
+
+DEFAULT_CHAPTER_DIR = "chapter_jsons"
+DEFAULT_MARKDOWN_DIR = "vocabulary_markdown"
+POLL_INTERVAL = 0.2
+DEBOUNCE_DELAY = 0.3
+
+
+class WatchBuilder:
+    """Warm copy of the word list and renderers; rewrites only the outputs an edit touches."""
+
+    def __init__(self, word_list: str = DEFAULT_WORD_LIST, sql_file: str = DEFAULT_SQL_FILE,
+                 chapter_dir: str = DEFAULT_CHAPTER_DIR, markdown_dir: str = DEFAULT_MARKDOWN_DIR,
+                 parts_dir: str = DEFAULT_PARTS_DIR, lean: bool = False,
+                 results_file: str = DEFAULT_RESULTS_FILE):
+        self.word_list = word_list
+        self.sql_file = sql_file
+        self.results_file = results_file
+        self.chapter_dir = chapter_dir
+        self.markdown_dir = markdown_dir
+        self.parts_dir = parts_dir
+        self.generator = VocabularyMarkdownGenerator(lean=lean)
+        self.title = ""
+        self.words: List[VocabEntry] = []
+        self.topics: Dict[int, Optional[str]] = {}
+        self.enrichment: Dict[int, Dict[str, Any]] = {}
+        # chapter number -> Markdown file last written for it
+        self.markdown_files: Dict[int, str] = {}
+
+    def _load(self, reload_topics: bool, reload_enrichment: bool) -> Tuple[str, List[VocabEntry]]:
+        if reload_topics:
+            self.topics = load_topics(self.sql_file) if os.path.exists(self.sql_file) else {}
+        if reload_enrichment:
+            self.enrichment = load_enrichment(self.results_file)
+        vocabulary = load_vocabulary(self.word_list)
+        words = merge_topics(vocabulary.entries, topics=self.topics)
+        apply_enrichment(words, self.enrichment)
+        return vocabulary.title, words
+
+    @property
+    def total_chapters(self) -> int:
+        return math.ceil(len(self.words) / WORDS_PER_CHAPTER)
+
+    def load(self):
+        """Load the current sources as the baseline without writing anything."""
+        self.title, self.words = self._load(reload_topics=True, reload_enrichment=True)
+
+    def build_all(self) -> List[str]:
+        """Load the sources and write every output."""
+        self.load()
+        return self._write(set(range(1, self.total_chapters + 1)),
+                           set(range(1, part_count(len(self.words)) + 1)))
+
+    @staticmethod
+    def changed_rows(old: List[VocabEntry], new: List[VocabEntry]) -> List[int]:
+        """Positions whose row differs, including rows added or removed at the end."""
+        changed = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+        changed.extend(range(min(len(old), len(new)), max(len(old), len(new))))
+        return changed
+
+    def rebuild(self, sql_changed: bool = True, results_changed: bool = True) -> Tuple[List[int], List[str]]:
+        """Reload the sources and rewrite what changed; return (changed positions, files written)."""
+        old_words, old_chapters, old_title = self.words, self.total_chapters, self.title
+        self.title, self.words = self._load(reload_topics=sql_changed, reload_enrichment=results_changed)
+        changed = self.changed_rows(old_words, self.words)
+        if not changed and self.title == old_title:
+            return [], []
+
+        if self.total_chapters != old_chapters:
+            # Every chapter shows the chapter count and the folder ranges move.
+            chapters = set(range(1, self.total_chapters + 1))
+        else:
+            chapters = {i // WORDS_PER_CHAPTER + 1 for i in changed if i < len(self.words)}
+        parts = {i // WORDS_PER_PART + 1 for i in changed if i < len(self.words)}
+        written = self._write(chapters, parts)
+        self._remove_stale(old_chapters, part_count(len(old_words)))
+        return changed, written
+
+    def _write(self, chapters: Set[int], parts: Set[int]) -> List[str]:
+        written = []
+        os.makedirs(self.chapter_dir, exist_ok=True)
+        for chapter_num in sorted(chapters):
+            chapter = make_chapter(self.words, chapter_num)
+            chapter_file = os.path.join(self.chapter_dir, f"chapter_{chapter_num:02d}.json")
+            save_chapter(chapter, chapter_file)
+            written.append(chapter_file)
+
+            folder = os.path.join(self.markdown_dir, self.generator.chapter_folder(chapter_num, self.total_chapters))
+            os.makedirs(folder, exist_ok=True)
+            markdown_file = os.path.join(folder, self.generator.chapter_filename(chapter))
+            with open(markdown_file, 'w', encoding='utf-8', buffering=BOOK_BUFFER_SIZE) as f:
+                f.writelines(self.generator.iter_chapter_markdown(chapter))
+            previous = self.markdown_files.get(chapter_num)
+            if previous and previous != markdown_file:
+                self._remove(previous)
+            self.markdown_files[chapter_num] = markdown_file
+            written.append(markdown_file)
+
+        if chapters or parts:
+            written.append(write_full_table(self.title, self.words, self.parts_dir))
+        for part_num in sorted(parts):
+            written.extend(write_part(self.words, part_num, self.parts_dir))
+        return written
+
+    def _remove_stale(self, old_chapters: int, old_parts: int):
+        """Delete chapter and part files left over after the list got shorter."""
+        stale = [os.path.join(self.chapter_dir, f"chapter_{n:02d}.json")
+                 for n in range(self.total_chapters + 1, old_chapters + 1)]
+        stale += [self.markdown_files.pop(n) for n in range(self.total_chapters + 1, old_chapters + 1)
+                  if n in self.markdown_files]
+        for part_num in range(part_count(len(self.words)) + 1, old_parts + 1):
+            stale += part_paths(self.parts_dir, part_num)
+        for path in stale:
+            self._remove(path)
+
+    def _remove(self, path: str):
+        """Delete an output file, and its chapter folder once that is empty."""
+        if os.path.exists(path):
+            os.remove(path)
+        folder = os.path.dirname(path)
+        if os.path.dirname(folder) == self.markdown_dir and not os.listdir(folder):
+            os.rmdir(folder)
+
+
+def snapshot(paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+    """``{path: (mtime_ns, size)}``, or None for files that are missing right now."""
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            state[path] = None
+    return state
+
+
+def watch(builder: WatchBuilder, interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE_DELAY):
+    """Poll the sources forever and rebuild once each burst of edits has settled."""
+    paths = [builder.word_list, builder.sql_file, builder.results_file]
+    last = snapshot(paths)
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        if current == last:
+            continue
+        # Editors often save in several writes; wait until the files stop changing.
+        while True:
+            time.sleep(debounce)
+            settled = snapshot(paths)
+            if settled == current:
+                break
+            current = settled
+        sql_changed = current[builder.sql_file] != last[builder.sql_file]
+        results_changed = current[builder.results_file] != last[builder.results_file]
+        last = current
+
+        start = time.perf_counter()
+        try:
+            changed, written = builder.rebuild(sql_changed, results_changed)
+        except (ValueError, OSError) as exc:
+            # Keep the previous state and outputs; the next save triggers another try.
+            print(f"❌ {exc}")
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        if written:
+            print(f"🔄 {len(changed)} changed rows → rewrote {len(written)} files in {elapsed:.0f} ms")
+        else:
+            print(f"✅ No row changes ({elapsed:.0f} ms)")
+
+
+def main():
+    """Build once (unless told not to), then keep the outputs in sync with the sources."""
+    parser = argparse.ArgumentParser(description="Rebuild chapters and parts whenever the word list changes.")
+    parser.add_argument("--words", default=DEFAULT_WORD_LIST, help="netem_full_list.json")
+    parser.add_argument("--sql", default=DEFAULT_SQL_FILE, help="netem_full_list.sql")
+    parser.add_argument("--chapters", default=DEFAULT_CHAPTER_DIR, help="chapter JSON directory")
+    parser.add_argument("--markdown", default=DEFAULT_MARKDOWN_DIR, help="chapter Markdown directory")
+    parser.add_argument("--parts", default=DEFAULT_PARTS_DIR, help="directory of netem_full_list.md and its parts")
+    parser.add_argument("--results", default=DEFAULT_RESULTS_FILE, help="enrichment results written by enrich.py")
+    parser.add_argument("--lean", action="store_true", help="use the lean Markdown render mode")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between polls")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_DELAY,
+                        help="seconds the sources must stay unchanged before rebuilding")
+    parser.add_argument("--no-initial-build", action="store_true",
+                        help="treat the current outputs as up to date instead of rebuilding everything first")
+    args = parser.parse_args()
+
+    builder = WatchBuilder(args.words, args.sql, args.chapters, args.markdown, args.parts, args.lean, args.results)
+    start = time.perf_counter()
+    if args.no_initial_build:
+        builder.load()
+    else:
+        written = builder.build_all()
+        print(f"📁 Initial build wrote {len(written)} files in {time.perf_counter() - start:.1f} s")
+    print(f"👀 Watching {args.words}, {args.sql} and {args.results} (Ctrl+C to stop)")
+    try:
+        watch(builder, args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ await connection.query(`SELECT word FROM ${table}`).then((res) => {
     records = res[0]
 })
 
+const updates = [];
 for (const record of records) {
     const word = record.word; // 获取单词字段的值
     const result = new SpellingVariations(word).analyze();
@@ -23,15 +24,23 @@ for (const record of records) {
             result.variations.filter((variant) => variant !== word)
         ); // 使用Set来确保唯一性
         const uniqueVariants = Array.from(uniqueVariantsSet).join(", ");
-        
-        const updateQuery = `UPDATE ${table} SET \`variant\` = ? WHERE \`word\` = ?`;
-        await connection.query(
-            updateQuery,
-            [uniqueVariants, word]
-        ).then(() => {
-            connection.end().then(() => {
-                console.log("connection closed")
-            })
-        });
+        updates.push([uniqueVariants, word]);
     }
 }
+
+// 所有更新放在一个事务里执行，全部完成后再关闭连接
+const updateQuery = `UPDATE ${table} SET \`variant\` = ? WHERE \`word\` = ?`;
+try {
+    await connection.beginTransaction();
+    for (const params of updates) {
+        await connection.query(updateQuery, params);
+    }
+    await connection.commit();
+    console.log(`updated ${updates.length} words`);
+} catch (error) {
+    await connection.rollback();
+    throw error;
+} finally {
+    await connection.end();
+    console.log("connection closed");
+}